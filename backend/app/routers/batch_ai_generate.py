@@ -35,7 +35,7 @@ class BatchGenerateResponse(BaseModel):
     word_results: List[dict]  # NEW: Detailed status for each word
 
 @router.post("/batch-generate", response_model=BatchGenerateResponse)
-async def batch_generate_flashcards(
+def batch_generate_flashcards(
     request: BatchGenerateRequest,
     db: Session = Depends(get_db)
 ):
@@ -48,6 +48,8 @@ async def batch_generate_flashcards(
     3. Save to database
     
     Note: Audio generation happens asynchronously after card creation
+    Note: Declared sync so FastAPI runs it in the threadpool; the OpenAI and
+    database calls block, and concurrent batches must not stall the event loop
     """
     
     logger.info("=" * 80)
@@ -285,6 +285,21 @@ def check_card_exists(word: str = Query(..., min_length=1), db: Session = Depend
         "url": f"/?cardId={card.id}",
     }
 
+
+@router.post("/exists", response_model=schemas.FlashcardExistsResponse)
+def check_cards_exist(payload: schemas.FlashcardExistsRequest, db: Session = Depends(get_db)):
+    """Case-insensitive bulk existence check, so clients don't download every card to filter a word list."""
+    words = sorted({word.strip().lower() for word in payload.words if word.strip()})
+    existing = set()
+    # Stay well under SQL Server's 2100 parameter limit
+    for start in range(0, len(words), 1000):
+        rows = db.query(func.lower(models.Flashcard.word_or_phrase)).filter(
+            models.Flashcard.language_id == str(payload.language_id),
+            func.lower(models.Flashcard.word_or_phrase).in_(words[start:start + 1000])
+        ).all()
+        existing.update(row[0] for row in rows)
+    return {"existing": sorted(existing)}
+
 @router.get("/{flashcard_id}", response_model=schemas.Flashcard)
 def read_flashcard(flashcard_id: str, db: Session = Depends(get_db)):
     """Get a specific flashcard by ID"""
@@ -195,6 +195,14 @@ class AIGenerateResponse(BaseModel):
     image_description: Optional[str] = None
     image_url: Optional[str] = None
 
+# Bulk existence check
+class FlashcardExistsRequest(BaseModel):
+    language_id: UUID
+    words: List[str]
+
+class FlashcardExistsResponse(BaseModel):
+    existing: List[str]  # Lowercased words that already have a card
+
 # User Authentication Schemas
 class UserBase(BaseModel):
     username: str
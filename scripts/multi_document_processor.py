@@ -5,23 +5,69 @@ Extracts vocabulary from multiple documents and deduplicates against existing fl
 """
 
 import re
+import sys
 import json
+import time
 import csv
+import codecs
 import requests
 from collections import Counter
 from pathlib import Path
 import unicodedata
-from typing import Set, Dict, List, Tuple
+from typing import Set, Dict, List, Tuple, Iterator
+from array import array
 import glob
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    from nltk.stem.snowball import FrenchStemmer
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
+
+try:
+    from tokenizers import Regex, pre_tokenizers
+    TOKENIZERS_AVAILABLE = True
+except ImportError:
+    TOKENIZERS_AVAILABLE = False
+
+class CountMinSketch:
+    """Fixed-memory frequency estimator; estimates may over-count but never under-count."""
+    
+    def __init__(self, width: int = 1 << 20, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.tables = [array('I', bytes(4 * width)) for _ in range(depth)]
+    
+    def add(self, item: str):
+        for row, table in enumerate(self.tables):
+            table[hash((row, item)) % self.width] += 1
+    
+    def check(self, item: str) -> int:
+        return min(table[hash((row, item)) % self.width] for row, table in enumerate(self.tables))
+
 class MultiDocumentProcessor:
     """Process multiple documents and deduplicate vocabulary."""
     
-    def __init__(self, server_url: str = "http://localhost:8000"):
+    def __init__(self, server_url: str = "http://localhost:8000", cache_file: str = None, verbose: bool = True,
+                 cache_ttl: int = 3600):
         self.server_url = server_url
+        self.verbose = verbose
+        # Cached word lists older than this many seconds are refetched (0 disables the word cache)
+        self.cache_ttl = cache_ttl
+        self.cache_file = Path(cache_file) if cache_file else Path.home() / '.cache' / 'super-flashcards' / 'state.json'
+        self.cache = self.load_cache()
+        # IDs and word lists differ between servers, so each server gets its own section
+        self.server_cache = self.cache.setdefault(server_url, {})
+        self.french_language_id = self.server_cache.get('fr_id')
         
         # Common French words to exclude (same as before)
-        self.common_words = {
+        self.common_words = frozenset(sys.intern(word) for word in {
             'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'et', 'ou', 'mais', 'donc', 
             'car', 'ni', 'or', 'ce', 'ces', 'cet', 'cette', 'mon', 'ma', 'mes', 'ton', 'ta', 
             'tes', 'son', 'sa', 'ses', 'notre', 'nos', 'votre', 'vos', 'leur', 'leurs',
@@ -40,9 +86,19 @@ class MultiDocumentProcessor:
             'quelque', 'quelques', 'certain', 'certaine', 'certains', 'certaines',
             'oui', 'non', 'ne', 'pas', 'point', 'rien', 'personne', 'aucun', 'aucune',
             'nul', 'nulle', 'guère', 'plus', 'jamais', 'ici', 'là', 'y', 'en'
-        }
+        })
         
         self.min_word_length = 3
+        word_regex = r'\b[a-zàâäéèêëïîôùûüÿçœæ]+(?:-[a-zàâäéèêëïîôùûüÿçœæ]+)*\b'
+        self.word_pattern = re.compile(word_regex, re.IGNORECASE)
+        
+        # Prefer the Rust-backed tokenizer when installed. It uses the same pattern; only
+        # \b around rare connector punctuation (e.g. the liaison mark ‿) differs from re
+        if TOKENIZERS_AVAILABLE:
+            splitter = pre_tokenizers.Split(Regex('(?i)' + word_regex), behavior='removed', invert=True)
+            self.tokenize = lambda text: [token for token, _ in splitter.pre_tokenize_str(text)]
+        else:
+            self.tokenize = self.word_pattern.findall
         
         # Character replacement mapping for encoding issues
         self.char_replacements = {
@@ -74,79 +130,196 @@ class MultiDocumentProcessor:
             '—': ['�', '--'],
             '…': ['�', '...']
         }
+        
+        # Flatten the mapping once into (wrong, correct) steps, kept in the original order:
+        # each step sees the output of the ones before it, so order decides e.g. 'a�' -> 'aé'.
+        # Identity steps and steps that can no longer match are dropped - once a single
+        # character has been replaced everywhere, a later pattern containing it is dead,
+        # unless some replacement puts that character back
+        produced = set(''.join(self.char_replacements))
+        replaced = set()
+        self.replacement_steps = []
+        for correct_char, wrong_chars in self.char_replacements.items():
+            for wrong_char in wrong_chars:
+                if wrong_char == correct_char or replaced.intersection(wrong_char):
+                    continue
+                self.replacement_steps.append((wrong_char, correct_char))
+                if len(wrong_char) == 1 and wrong_char not in produced:
+                    replaced.add(wrong_char)
     
     def fix_encoding_issues(self, text: str) -> str:
         """Fix common character encoding issues in the text."""
-        fixed_text = text
-        for correct_char, wrong_chars in self.char_replacements.items():
-            for wrong_char in wrong_chars:
-                fixed_text = fixed_text.replace(wrong_char, correct_char)
-        return unicodedata.normalize('NFC', fixed_text)
+        for wrong_char, correct_char in self.replacement_steps:
+            if wrong_char in text:
+                text = text.replace(wrong_char, correct_char)
+        return unicodedata.normalize('NFC', text)
     
-    def extract_words_from_file(self, file_path: str) -> List[str]:
-        """Extract French words from a single text file."""
+    def detect_encoding(self, file_path: str, sample_size: int = 65536) -> str:
+        """Detect a file's encoding once from a BOM or a sample of its leading bytes."""
+        with open(file_path, 'rb') as file:
+            sample = file.read(sample_size)
+        
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        
         try:
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            text = None
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as file:
-                        text = file.read()
-                    print(f"✅ Read {Path(file_path).name} with {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if text is None:
-                raise ValueError(f"Could not read file {file_path} with any supported encoding")
-            
-            # Fix encoding issues
-            text = self.fix_encoding_issues(text)
-            text = text.lower()
-            
-            # Extract words using regex
-            words = re.findall(r'\b[a-zàâäéèêëïîôùûüÿçœæ]+(?:-[a-zàâäéèêëïîôùûüÿçœæ]+)*\b', text)
+            # Incremental decode tolerates a multi-byte character cut off at the sample boundary
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'cp1252'
+    
+    def iter_words_from_file(self, file_path: str) -> Iterator[str]:
+        """Yield filtered French words from a single text file, streaming it line by line."""
+        try:
+            encoding = self.detect_encoding(file_path)
             
-            # Filter out common words and short words
-            filtered_words = [
-                word for word in words 
-                if len(word) >= self.min_word_length 
-                and word not in self.common_words
-                and not word.isdigit()
-            ]
+            with open(file_path, 'r', encoding=encoding, errors='replace') as file:
+                for line in file:
+                    # Fix encoding issues and tokenize one line at a time,
+                    # lowercasing only the matched words rather than the whole line
+                    line = self.fix_encoding_issues(line)
+                    for word in map(str.lower, self.tokenize(line)):
+                        if len(word) >= self.min_word_length:
+                            # Interned words hit the identity fast path in set/Counter lookups
+                            word = sys.intern(word)
+                            if word not in self.common_words:
+                                yield word
             
-            return filtered_words
+            if self.verbose:
+                print(f"✅ Read {Path(file_path).name} with {encoding} encoding")
             
         except Exception as e:
             print(f"❌ Error processing file {file_path}: {e}")
-            return []
     
-    def get_existing_flashcards(self) -> Set[str]:
+    def extract_words_from_file(self, file_path: str) -> Counter:
+        """Extract French word counts from a single text file."""
+        return Counter(self.iter_words_from_file(file_path))
+    
+    def count_words_with_sketch(self, text_files: List[str], min_frequency: int) -> Counter:
+        """Count word frequencies in bounded memory for corpora too large for an exact Counter.
+        
+        The first pass feeds every word into a count-min sketch; the second pass keeps
+        exact counts only for words whose sketch estimate reaches min_frequency.
+        """
+        sketch = CountMinSketch()
+        for file_path in text_files:
+            print(f"🔄 Sketching: {Path(file_path).name}")
+            for word in self.iter_words_from_file(file_path):
+                sketch.add(word)
+        
+        word_counts = Counter()
+        for file_path in text_files:
+            print(f"🔄 Counting: {Path(file_path).name}")
+            word_counts.update(
+                word for word in self.iter_words_from_file(file_path)
+                if sketch.check(word) >= min_frequency
+            )
+        return word_counts
+    
+    def merge_inflections(self, word_counts: Counter) -> Counter:
+        """Collapse inflected forms (parle, parles, parlé) onto their most frequent surface form."""
+        if not NLTK_AVAILABLE:
+            print("⚠️ nltk not installed, skipping inflection merging (pip install nltk)")
+            return word_counts
+        
+        # Stem each unique word once rather than every token occurrence
+        stem = FrenchStemmer().stem
+        representatives = {}
+        merged_counts = Counter()
+        for word, count in word_counts.most_common():
+            # most_common() order makes the first form seen for a stem its most frequent one
+            merged_counts[representatives.setdefault(stem(word), word)] += count
+        
+        print(f"🔗 Merged {len(word_counts)} word forms into {len(merged_counts)} stems")
+        return merged_counts
+    
+    def load_cache(self) -> Dict:
+        """Load the on-disk state cache: per server URL, the French language ID and word lists."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Keep only per-server sections (drops entries written by older versions of this script)
+        return {key: value for key, value in cache.items() if isinstance(value, dict)}
+    
+    def save_cache(self):
+        """Persist the state cache so warm runs can skip redundant API round-trips."""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ Could not write cache {self.cache_file}: {e}")
+    
+    def get_french_language_id(self) -> str:
+        """Get the French language ID, using the cached value when available."""
+        if self.french_language_id:
+            return self.french_language_id
+        
+        response = requests.get(f"{self.server_url}/api/languages/")
+        if response.status_code != 200:
+            print(f"❌ Could not fetch languages: {response.status_code}")
+            return None
+        
+        languages = response.json()
+        french_lang = next((lang for lang in languages if lang['code'] == 'fr'), None)
+        if not french_lang:
+            print("❌ French language not found in database")
+            return None
+        
+        self.french_language_id = french_lang['id']
+        self.server_cache['fr_id'] = self.french_language_id
+        self.save_cache()
+        return self.french_language_id
+    
+    def get_existing_flashcards(self, page_size: int = 1000) -> Set[str]:
         """Get all existing French flashcard words from the database."""
         try:
             # Get French language ID
-            response = requests.get(f"{self.server_url}/api/languages/")
-            if response.status_code != 200:
-                print(f"❌ Could not fetch languages: {response.status_code}")
+            french_language_id = self.get_french_language_id()
+            if not french_language_id:
                 return set()
             
-            languages = response.json()
-            french_lang = next((lang for lang in languages if lang['code'] == 'fr'), None)
+            # Reuse a recent word list for this server and language instead of downloading every card.
+            # The API has no change marker (ETag/updated-since), so freshness is purely age-based:
+            # cards added, edited or deleted within cache_ttl are not seen until the list expires.
+            cache_key = f"words:{french_language_id}"
+            cached = self.server_cache.get(cache_key)
+            if cached and time.time() - cached['fetched_at'] < self.cache_ttl:
+                existing_words = set(cached['words'])
+                print(f"📚 Found {len(existing_words)} existing flashcards (cached)")
+                return existing_words
             
-            if not french_lang:
-                print("❌ French language not found in database")
-                return set()
-            
-            # Get existing flashcards
-            response = requests.get(f"{self.server_url}/api/flashcards/?language_id={french_lang['id']}")
-            if response.status_code != 200:
-                print(f"❌ Could not fetch flashcards: {response.status_code}")
-                return set()
+            # Get existing flashcards one page at a time, keeping only the words
+            existing_words = set()
+            skip = 0
+            while True:
+                response = requests.get(
+                    f"{self.server_url}/api/flashcards/",
+                    params={'language_id': french_language_id, 'skip': skip, 'limit': page_size},
+                    stream=True
+                )
+                with response:
+                    if response.status_code != 200:
+                        print(f"❌ Could not fetch flashcards: {response.status_code}")
+                        return set()
+                    
+                    if IJSON_AVAILABLE:
+                        response.raw.decode_content = True
+                        page_words = list(ijson.items(response.raw, 'item.word_or_phrase'))
+                    else:
+                        page_words = [card['word_or_phrase'] for card in response.json()]
+                
+                existing_words.update(word.lower() for word in page_words)
+                if len(page_words) < page_size:
+                    break
+                skip += page_size
             
-            flashcards = response.json()
-            existing_words = {card['word_or_phrase'].lower() for card in flashcards}
+            if self.cache_ttl > 0:
+                self.server_cache[cache_key] = {'fetched_at': time.time(), 'words': sorted(existing_words)}
+                self.save_cache()
             
             print(f"📚 Found {len(existing_words)} existing flashcards in database")
             return existing_words
@@ -155,8 +328,13 @@ class MultiDocumentProcessor:
             print(f"❌ Error fetching existing flashcards: {e}")
             return set()
     
-    def process_multiple_documents(self, input_dir: str, output_file: str, min_frequency: int = 2):
-        """Process multiple text files and create deduplicated vocabulary."""
+    def process_multiple_documents(self, input_dir: str, output_file: str, min_frequency: int = 2,
+                                   use_sketch: bool = False, merge_inflections: bool = False):
+        """Process multiple text files and create deduplicated vocabulary.
+        
+        Set use_sketch for book-scale corpora whose vocabulary does not fit in memory, and
+        merge_inflections to count inflected forms of a word as one vocabulary entry.
+        """
         
         print("🚀 Starting Multi-Document Vocabulary Processing...")
         print(f"📁 Input directory: {input_dir}")
@@ -174,51 +352,52 @@ class MultiDocumentProcessor:
             print(f"  - {Path(file_path).name}")
         print()
         
-        # Extract words from all files
-        all_words = []
-        for file_path in text_files:
-            print(f"🔄 Processing: {Path(file_path).name}")
-            words = self.extract_words_from_file(file_path)
-            all_words.extend(words)
-        
-        print(f"\n📊 Extracted {len(all_words)} total words from all files")
-        
-        # Count word frequencies
-        word_counts = Counter(all_words)
+        # Count word frequencies across all files
+        if use_sketch:
+            word_counts = self.count_words_with_sketch(text_files, min_frequency)
+        else:
+            word_counts = Counter()
+            for file_path in text_files:
+                print(f"🔄 Processing: {Path(file_path).name}")
+                word_counts.update(self.extract_words_from_file(file_path))
         
-        # Filter by minimum frequency
-        filtered_vocab = {
-            word: count for word, count in word_counts.items() 
-            if count >= min_frequency
-        }
+        print(f"\n📊 Extracted {sum(word_counts.values())} total words from all files")
         
-        print(f"📊 {len(filtered_vocab)} unique words after frequency filtering (min: {min_frequency})")
+        if merge_inflections:
+            word_counts = self.merge_inflections(word_counts)
         
         # Get existing flashcards for deduplication
         print("\n🔍 Checking existing flashcards for deduplication...")
         existing_words = self.get_existing_flashcards()
         
-        # Remove words that already exist
-        new_vocabulary = {
-            word: count for word, count in filtered_vocab.items()
-            if word not in existing_words
-        }
+        # Remove words that already exist, using a set intersection on the Counter keys
+        duplicate_count = 0
+        for word in word_counts.keys() & existing_words:
+            if word_counts.pop(word) >= min_frequency:
+                duplicate_count += 1
         
-        duplicate_count = len(filtered_vocab) - len(new_vocabulary)
+        # Filter by minimum frequency in one pass over the counts,
+        # which most_common() already yields sorted by frequency
+        sorted_vocab = []
+        for word, count in word_counts.most_common():
+            if count < min_frequency:
+                break
+            sorted_vocab.append((word, count))
+        new_vocabulary = dict(sorted_vocab)
+        
+        print(f"📊 {len(sorted_vocab) + duplicate_count} unique words after frequency filtering (min: {min_frequency})")
         print(f"🔄 Removed {duplicate_count} duplicate words already in database")
         print(f"✨ {len(new_vocabulary)} new words ready for processing")
         
-        # Sort by frequency (descending)
-        sorted_vocab = sorted(new_vocabulary.items(), key=lambda x: x[1], reverse=True)
-        
         # Export to CSV
         try:
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
                 writer.writerow(['word_or_phrase', 'definition', 'etymology', 'english_cognates', 'related_words', 'language'])
-                
-                for word, frequency in sorted_vocab:
-                    writer.writerow([word, '[To be translated]', f'Found {frequency} times across documents', '', '', 'french'])
+                writer.writerows(
+                    (word, '[To be translated]', f'Found {frequency} times across documents', '', '', 'french')
+                    for word, frequency in sorted_vocab
+                )
             
             print(f"\n✅ Exported {len(new_vocabulary)} new words to {output_file}")
             
@@ -246,8 +425,7 @@ class MultiDocumentProcessor:
 
 🏆 Top 10 Most Frequent New Words:
 """
-        for i, (word, freq) in enumerate(top_words, 1):
-            summary += f"{i:2d}. {word:<20} ({freq:,} times)\n"
+        summary += ''.join(f"{i:2d}. {word:<20} ({freq:,} times)\n" for i, (word, freq) in enumerate(top_words, 1))
         
         return summary
 
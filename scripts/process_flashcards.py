@@ -9,11 +9,21 @@ import json
 import time
 from typing import List, Dict
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Only these fields of the AI response are needed for the progress log
+SUMMARY_FIELDS = ('definition', 'etymology', 'image_url')
+
 class FlashcardProcessor:
     """Process flashcards through AI generation API."""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", verbose: bool = True):
         self.base_url = base_url
+        self.verbose = verbose
         self.french_language_id = "9e4d5ca8-ffec-47b9-9943-5f2dd1093593"  # French language ID
     
     def get_incomplete_flashcards(self) -> List[Dict]:
@@ -37,6 +47,20 @@ class FlashcardProcessor:
             print(f"❌ Error fetching flashcards: {e}")
             return []
     
+    def read_summary_fields(self, response: requests.Response) -> Dict:
+        """Read only the logged fields from an AI response, skipping the full JSON parse when possible."""
+        if not IJSON_AVAILABLE:
+            return response.json()
+        
+        response.raw.decode_content = True
+        fields = {}
+        for key, value in ijson.kvitems(response.raw, ''):
+            if key in SUMMARY_FIELDS:
+                fields[key] = value
+                if len(fields) == len(SUMMARY_FIELDS):
+                    break
+        return fields
+    
     def process_flashcard_with_ai(self, flashcard: Dict) -> bool:
         """Process a single flashcard through the AI generation API."""
         try:
@@ -52,23 +76,26 @@ class FlashcardProcessor:
                 "include_image": True
             }
             
-            response = requests.post(
+            with requests.post(
                 f"{self.base_url}/api/ai/generate",
                 json=ai_request,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                ai_result = response.json()
-                print(f"✅ AI generated content for: {word}")
-                print(f"   Definition: {ai_result.get('definition', 'N/A')[:50]}...")
-                print(f"   Etymology: {ai_result.get('etymology', 'N/A')[:50]}...")
-                print(f"   Image: {'Yes' if ai_result.get('image_url') else 'No'}")
-                return True
-            else:
-                print(f"❌ AI generation failed for {word}: {response.status_code}")
-                print(f"   Response: {response.text}")
-                return False
+                stream=True
+            ) as response:
+                if response.status_code == 200:
+                    print(f"✅ AI generated content for: {word}")
+                    if self.verbose:
+                        ai_result = self.read_summary_fields(response)
+                        # One write per card instead of one per detail line
+                        print(
+                            f"   Definition: {ai_result.get('definition', 'N/A')[:50]}...\n"
+                            f"   Etymology: {ai_result.get('etymology', 'N/A')[:50]}...\n"
+                            f"   Image: {'Yes' if ai_result.get('image_url') else 'No'}"
+                        )
+                    return True
+                else:
+                    print(f"❌ AI generation failed for {word}: {response.status_code}")
+                    print(f"   Response: {response.text}")
+                    return False
                 
         except Exception as e:
             print(f"❌ Error processing {flashcard.get('word_or_phrase', 'unknown')}: {e}")
@@ -3,34 +3,111 @@
 Robust Batch Processor - Handles crashes, resumes, and shows accurate progress
 """
 
+import asyncio
+import codecs
 import csv
 import json
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 import sys
 import os
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def to_json_bytes(data, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, indent=2 if pretty else None, ensure_ascii=False).encode('utf-8')
+
+# Column names that mark a repeated header row rather than a word
+HEADER_NAMES = frozenset({'word_or_phrase', 'french_text'})
+
+# Prebuilt 50-character progress bars, indexed by the number of filled cells
+PROGRESS_BARS = ['█' * filled + '░' * (50 - filled) for filled in range(51)]
+
 class RobustBatchProcessor:
     """Robust batch processor with crash recovery and accurate progress tracking."""
     
-    def __init__(self, server_url: str = "http://localhost:8000"):
+    # Minimum seconds between progress bar redraws
+    PROGRESS_INTERVAL = 0.1
+    
+    # Seconds a successful /health probe is trusted before probing again
+    HEALTH_TTL = 15.0
+    
+    # Generation attempts per word, across resumed runs, before it is left as failed
+    MAX_ATTEMPTS = 3
+    
+    def __init__(self, server_url: str = "http://localhost:8000", concurrency: int = 4, batch_size: int = 8):
         self.server_url = server_url
+        self.concurrency = concurrency
+        # Words per /api/ai/batch-generate request; 1 uses the per-word /api/ai/generate endpoint
+        self.batch_size = batch_size
         self.french_lang_id = "9e4d5ca8-ffec-47b9-9943-5f2dd1093593"
         
+        # Shared HTTP session so every request reuses pooled keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1.0,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["GET", "POST"],
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Consecutive throttled (429/503) responses, drives the adaptive backoff
+        self._consecutive_throttles = 0
+        
+        # Last progress bar redraw (time.monotonic) and its (filled, eta) contents
+        self._last_progress_time = 0.0
+        self._last_progress = None
+        
+        # Last successful health probe (time.monotonic), 0 forces a fresh probe
+        self._last_health_ok = 0.0
+        
         # Progress tracking
         self.total_words = 0
+        self._pct_per_word = 0.0
+        self._bar_per_word = 0.0
         self.processed_words = 0
         self.successful_words = 0
         self.failed_words = 0
         self.start_time = None
-        self.processing_times = []
+        # Rolling window of the last 5 processing times with a running sum for the ETA
+        self.recent_times = deque(maxlen=5)
+        self.recent_times_sum = 0.0
         
         # Resume functionality
         self.progress_file = "Output/batch_progress.json"
         self.results_file = "Output/robust_batch_results.json"
+        self.results_log_file = self.results_file + "l"  # append-only JSONL checkpoint
+        self._processed_set: Set[str] = set()
+        # Attempts already spent on words that failed in a previous run and are re-queued
+        self._attempts: Dict[str, int] = {}
         
         # Sample words to exclude
         self.sample_words = {
@@ -38,170 +115,353 @@ class RobustBatchProcessor:
         }
     
     def load_progress(self) -> Dict:
-        """Load previous progress if exists."""
+        """Load previous progress if exists, falling back to a leftover .tmp checkpoint."""
+        for path in (self.progress_file, self.progress_file + '.tmp'):
+            try:
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+            except Exception as e:
+                print(f"⚠️ Could not load progress from {path}: {e}")
+        return {}
+    
+    def write_json_atomic(self, path: str, data):
+        """Write pretty JSON to a sibling .tmp file, fsync it, then atomically replace the target."""
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(to_json_bytes(data, pretty=True))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    
+    def load_processed_words(self) -> Set[str]:
+        """Rebuild the set of processed words by streaming the JSONL checkpoint.
+        
+        Words whose last result failed with attempts to spare are left out of the
+        set and their attempt count is kept in self._attempts so they are retried.
+        """
+        last_attempts = {}
         try:
-            if os.path.exists(self.progress_file):
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            if os.path.exists(self.results_log_file):
+                with open(self.results_log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            result = json.loads(line)
+                            word = result['word']
+                        except (ValueError, KeyError):
+                            continue  # Partially written line from a crash
+                        if result.get('status') == 'success':
+                            last_attempts[word] = self.MAX_ATTEMPTS
+                        else:
+                            # Entries written before attempts were tracked are not retried
+                            last_attempts[word] = result.get('attempts', self.MAX_ATTEMPTS)
         except Exception as e:
-            print(f"⚠️ Could not load progress: {e}")
-        return {}
+            print(f"⚠️ Could not load checkpoint: {e}")
+        
+        self._attempts = {word: n for word, n in last_attempts.items() if n < self.MAX_ATTEMPTS}
+        return {word for word, n in last_attempts.items() if n >= self.MAX_ATTEMPTS}
+    
+    def append_result(self, results_log, result: Dict):
+        """Append one result to the JSONL checkpoint and force it to disk."""
+        results_log.write(to_json_bytes(result) + b"\n")
+        results_log.flush()
+        os.fsync(results_log.fileno())
     
-    def save_progress(self, processed_words: List[str], results: List[Dict]):
-        """Save current progress."""
+    def save_summary(self, total_processed: int, last_word: str):
+        """Save a small progress summary; the per-word detail lives in the JSONL checkpoint."""
         try:
-            progress = {
+            summary = {
                 'timestamp': datetime.now().isoformat(),
-                'processed_words': processed_words,
-                'total_processed': len(processed_words),
-                'successful': len([r for r in results if r['status'] == 'success']),
-                'failed': len([r for r in results if r['status'] != 'success'])
+                'total_processed': total_processed,
+                'successful': self.successful_words,
+                'failed': self.failed_words,
+                'last_word': last_word
             }
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, indent=2)
-            
-            # Also save full results
-            with open(self.results_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
-                
+            self.write_json_atomic(self.progress_file, summary)
         except Exception as e:
             print(f"⚠️ Could not save progress: {e}")
     
-    def check_server_health(self) -> bool:
-        """Check if server is responding."""
+    def save_results(self):
+        """Compact the JSONL checkpoint into the pretty-printed results file."""
         try:
-            response = requests.get(f"{self.server_url}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+            results = []
+            if os.path.exists(self.results_log_file):
+                with open(self.results_log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            results.append(json.loads(line))
+                        except ValueError:
+                            continue
+            self.write_json_atomic(self.results_file, results)
+        except Exception as e:
+            print(f"⚠️ Could not save results: {e}")
     
-    def get_existing_flashcards(self) -> Set[str]:
-        """Get existing flashcard words."""
+    async def check_server_health(self, client: httpx.AsyncClient) -> bool:
+        """Check if server is responding, reusing a recent successful probe."""
+        now = time.monotonic()
+        if now - self._last_health_ok < self.HEALTH_TTL:
+            return True
+        
         try:
-            response = requests.get(f"{self.server_url}/api/flashcards/?language_id={self.french_lang_id}")
+            response = await client.get(f"{self.server_url}/health", timeout=5)
             if response.status_code == 200:
-                flashcards = response.json()
-                return {card['word_or_phrase'].lower() for card in flashcards}
+                self._last_health_ok = now
+                return True
+            return False
+        except Exception:
+            return False
+    
+    def get_existing_flashcards(self, page_size: int = 1000) -> Set[str]:
+        """Get existing flashcard words, parsing only the word_or_phrase values out of each page."""
+        existing = set()
+        skip = 0
+        try:
+            while True:
+                # The endpoint always returns full cards; the savings are client-side (streamed parse)
+                with self.session.get(
+                    f"{self.server_url}/api/flashcards/",
+                    params={
+                        'language_id': self.french_lang_id,
+                        'skip': skip,
+                        'limit': page_size
+                    },
+                    stream=True,
+                    timeout=(5, 30)
+                ) as response:
+                    if response.status_code != 200:
+                        print(f"❌ Could not fetch flashcards: {response.status_code}")
+                        break
+                    
+                    if IJSON_AVAILABLE:
+                        response.raw.decode_content = True
+                        page_words = list(ijson.items(response.raw, 'item.word_or_phrase'))
+                    else:
+                        page_words = [card['word_or_phrase'] for card in response.json()]
+                
+                existing.update(word.lower() for word in page_words)
+                if len(page_words) < page_size:
+                    break
+                skip += page_size
         except Exception as e:
             print(f"❌ Error fetching existing flashcards: {e}")
-        return set()
+        return existing
     
-    def load_selected_words(self, csv_files: List[str]) -> List[str]:
-        """Load selected words from CSV files."""
-        all_words = set()
+    def detect_encoding(self, file_path: str) -> str:
+        """Detect a file's encoding once from its BOM or leading bytes."""
+        with open(file_path, 'rb') as f:
+            sample = f.read(65536)
+        
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'cp1252'
+    
+    def load_selected_words_from_file(self, csv_file: str) -> Set[str]:
+        """Load selected (marked 'x') words from one CSV file."""
+        words = set()
+        encoding = self.detect_encoding(csv_file)
+        column = 'word_or_phrase' if 'new_documents' in csv_file else 'french_text'
         
-        for csv_file in csv_files:
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+        with open(csv_file, 'r', encoding=encoding, errors='replace', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if column not in header:
+                print(f"⚠️ Column '{column}' not found in {Path(csv_file).name}")
+                return words
             
-            for encoding in encodings:
-                try:
-                    with open(csv_file, 'r', encoding=encoding) as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            marker = list(row.values())[0].strip().lower()
-                            if marker in ['x']:
-                                if 'new_documents' in csv_file:
-                                    word = row['word_or_phrase'].strip()
-                                else:
-                                    word = row['french_text'].strip()
-                                if word and word != 'word_or_phrase' and word != 'french_text':
-                                    all_words.add(word.lower())
-                    print(f"✅ Loaded words from {Path(csv_file).name} using {encoding}")
-                    break
-                except UnicodeDecodeError:
-                    continue
+            # The selection marker is always the first column
+            marker_idx = 0
+            word_idx = header.index(column)
+            for row in reader:
+                if len(row) > word_idx and row[marker_idx].strip().lower() == 'x':
+                    word = row[word_idx].strip().lower()
+                    if word and word not in HEADER_NAMES:
+                        words.add(word)
+        print(f"✅ Loaded words from {Path(csv_file).name} using {encoding}")
+        return words
+    
+    def load_selected_words(self, csv_files: List[str]) -> List[str]:
+        """Load selected words from CSV files, reading the files in parallel."""
+        if not csv_files:
+            return []
+        
+        # File reads release the GIL, so slow (e.g. network drive) files overlap
+        with ThreadPoolExecutor(max_workers=min(8, len(csv_files))) as executor:
+            per_file_words = list(executor.map(self.load_selected_words_from_file, csv_files))
         
-        return sorted(list(all_words))
+        return sorted(set().union(*per_file_words))
+    
+    async def _post_generate(self, client: httpx.AsyncClient, word: str) -> httpx.Response:
+        """Send one AI generation request."""
+        return await client.post(
+            f"{self.server_url}/api/ai/generate",
+            json={
+                "word_or_phrase": word,
+                "language_id": self.french_lang_id,
+                "include_image": True
+            },
+            timeout=300  # 5 minute timeout
+        )
     
-    def generate_flashcard(self, word: str) -> Dict:
+    def is_retryable(self, status: str, http_status: Optional[int]) -> bool:
+        """Timeouts, dropped connections and HTTP 5xx are worth another attempt."""
+        return status in ('timeout', 'connection_error') or (http_status or 0) >= 500
+    
+    async def generate_flashcard(self, client: httpx.AsyncClient, word: str, attempt: int = 1) -> Dict:
         """Generate a single flashcard with comprehensive error handling."""
         word_start_time = time.time()
+        attempts = self._attempts.get(word, 0) + attempt
         
+        # Check server health first
+        if not await self.check_server_health(client):
+            return {
+                'word': word,
+                'status': 'server_down',
+                'processing_time': time.time() - word_start_time,
+                'error': 'Server is not responding',
+                'attempts': attempts - 1  # Nothing was sent, the attempt is not spent
+            }
+        
+        status, error, data, http_status = 'error', None, None, None
         try:
-            # Check server health first
-            if not self.check_server_health():
-                return {
-                    'word': word,
-                    'status': 'server_down',
-                    'processing_time': time.time() - word_start_time,
-                    'error': 'Server is not responding'
-                }
-            
             # Make the AI generation request
-            response = requests.post(
-                f"{self.server_url}/api/ai/generate",
+            response = await self._post_generate(client, word)
+            if response.status_code == 200:
+                data = response.json()
+                status = 'success'
+            else:
+                error_text = response.text[:200] if response.text else 'Unknown error'
+                status, error = 'failed', f"HTTP {response.status_code}: {error_text}"
+                http_status = response.status_code
+        except httpx.TimeoutException:
+            status, error = 'timeout', 'Request timed out after 5 minutes'
+        except httpx.NetworkError:
+            status, error = 'connection_error', 'Connection lost to server'
+            # Re-probe health before the next word instead of trusting the cache
+            self._last_health_ok = 0.0
+        except Exception as e:
+            error = str(e)
+        finally:
+            processing_time = time.time() - word_start_time
+            self.record_time(processing_time)
+        
+        # Retry transient failures with exponential backoff while attempts remain
+        if status != 'success' and self.is_retryable(status, http_status) and attempts < self.MAX_ATTEMPTS:
+            await asyncio.sleep(min(60, 2 ** attempt))
+            return await self.generate_flashcard(client, word, attempt + 1)
+        
+        result = {'word': word, 'status': status, 'processing_time': processing_time, 'attempts': attempts}
+        if status == 'success':
+            self.successful_words += 1
+            result.update({
+                'flashcard_id': data.get('id'),
+                'definition': data.get('definition', ''),
+                'etymology': data.get('etymology', ''),
+                'image_url': data.get('image_url', '')
+            })
+        else:
+            self.failed_words += 1
+            result['error'] = error
+            if http_status is not None:
+                result['http_status'] = http_status
+        return result
+    
+    async def generate_flashcards_batch(self, client: httpx.AsyncClient, words: List[str], attempt: int = 1) -> List[Dict]:
+        """Generate several flashcards in one /api/ai/batch-generate request, one result per word."""
+        batch_start_time = time.time()
+        
+        # Check server health first
+        if not await self.check_server_health(client):
+            return [{
+                'word': word,
+                'status': 'server_down',
+                'processing_time': time.time() - batch_start_time,
+                'error': 'Server is not responding',
+                'attempts': self._attempts.get(word, 0) + attempt - 1
+            } for word in words]
+        
+        status, error, word_results, http_status = 'error', None, {}, None
+        try:
+            response = await client.post(
+                f"{self.server_url}/api/ai/batch-generate",
                 json={
-                    "word_or_phrase": word,
+                    "words": words,
                     "language_id": self.french_lang_id,
-                    "include_image": True
+                    "include_images": True
                 },
-                timeout=300  # 5 minute timeout
+                timeout=300 * len(words)  # The server generates the batch one word at a time
             )
-            
-            processing_time = time.time() - word_start_time
-            self.processing_times.append(processing_time)
-            
             if response.status_code == 200:
-                result = response.json()
-                self.successful_words += 1
-                return {
-                    'word': word,
-                    'status': 'success',
-                    'processing_time': processing_time,
-                    'flashcard_id': result.get('id'),
-                    'definition': result.get('definition', ''),
-                    'etymology': result.get('etymology', ''),
-                    'image_url': result.get('image_url', '')
-                }
+                word_results = {item['word']: item for item in response.json().get('word_results', [])}
+                status = 'success'
             else:
-                self.failed_words += 1
                 error_text = response.text[:200] if response.text else 'Unknown error'
-                return {
-                    'word': word,
-                    'status': 'failed',
-                    'processing_time': processing_time,
-                    'error': f"HTTP {response.status_code}: {error_text}"
-                }
-                
-        except requests.exceptions.Timeout:
-            processing_time = time.time() - word_start_time
-            self.processing_times.append(processing_time)
-            self.failed_words += 1
-            return {
-                'word': word,
-                'status': 'timeout',
-                'processing_time': processing_time,
-                'error': 'Request timed out after 5 minutes'
-            }
-        except requests.exceptions.ConnectionError:
-            processing_time = time.time() - word_start_time
-            self.failed_words += 1
-            return {
-                'word': word,
-                'status': 'connection_error',
-                'processing_time': processing_time,
-                'error': 'Connection lost to server'
-            }
+                status, error = 'failed', f"HTTP {response.status_code}: {error_text}"
+                http_status = response.status_code
+        except httpx.TimeoutException:
+            status, error = 'timeout', f"Batch request timed out after {5 * len(words)} minutes"
+        except httpx.NetworkError:
+            status, error = 'connection_error', 'Connection lost to server'
+            # Re-probe health before the next batch instead of trusting the cache
+            self._last_health_ok = 0.0
         except Exception as e:
-            processing_time = time.time() - word_start_time
-            self.processing_times.append(processing_time)
-            self.failed_words += 1
-            return {
-                'word': word,
-                'status': 'error',
-                'processing_time': processing_time,
-                'error': str(e)
-            }
+            error = str(e)
+        finally:
+            # Spread the batch time evenly so the ETA stays per word
+            processing_time = (time.time() - batch_start_time) / len(words)
+        
+        # A transient failure of the whole request is retried for the words with attempts left
+        retry_words = []
+        if status != 'success' and self.is_retryable(status, http_status):
+            retry_words = [word for word in words if self._attempts.get(word, 0) + attempt < self.MAX_ATTEMPTS]
+            retry_set = set(retry_words)
+            words = [word for word in words if word not in retry_set]
+        
+        results = []
+        for word in words:
+            self.record_time(processing_time)
+            result = {'word': word, 'processing_time': processing_time, 'attempts': self._attempts.get(word, 0) + attempt}
+            word_result = word_results.get(word)
+            if word_result and word_result.get('status') == 'success':
+                self.successful_words += 1
+                result.update({'status': 'success', 'flashcard_id': word_result.get('flashcard_id')})
+            else:
+                self.failed_words += 1
+                if status == 'success':
+                    result.update({
+                        'status': 'failed',
+                        'error': word_result.get('error') if word_result else 'Missing from batch response'
+                    })
+                else:
+                    result.update({'status': status, 'error': error})
+                    if http_status is not None:
+                        result['http_status'] = http_status
+            results.append(result)
+        
+        if retry_words:
+            await asyncio.sleep(min(60, 2 ** attempt))
+            results.extend(await self.generate_flashcards_batch(client, retry_words, attempt + 1))
+        return results
+    
+    def record_time(self, processing_time: float):
+        """Add a processing time to the rolling ETA window."""
+        if len(self.recent_times) == self.recent_times.maxlen:
+            self.recent_times_sum -= self.recent_times[0]
+        self.recent_times.append(processing_time)
+        self.recent_times_sum += processing_time
     
     def calculate_eta(self) -> str:
         """Calculate ETA based on recent processing times."""
-        if len(self.processing_times) < 2:
+        if len(self.recent_times) < 2:
             return "Calculating ETA..."
         
-        recent_times = self.processing_times[-5:]
-        avg_time = sum(recent_times) / len(recent_times)
+        avg_time = self.recent_times_sum / len(self.recent_times)
         remaining_words = self.total_words - self.processed_words
-        estimated_seconds = remaining_words * avg_time
+        # Up to `concurrency` words are generated at the same time
+        estimated_seconds = remaining_words * avg_time / max(1, min(self.concurrency, remaining_words))
         
         if estimated_seconds < 60:
             return f"ETA: {estimated_seconds:.0f}s"
@@ -213,18 +473,25 @@ class RobustBatchProcessor:
             return f"ETA: {hours:.1f}h"
     
     def display_progress(self, current: int, total: int):
-        """Display progress with ETA."""
+        """Display progress with ETA, at most every PROGRESS_INTERVAL seconds."""
         if total == 0:
             return
-            
-        percent = (current / total) * 100
-        filled = int(50 * current // total)
-        bar = '█' * filled + '░' * (50 - filled)
+        
+        now = time.monotonic()
+        if now - self._last_progress_time < self.PROGRESS_INTERVAL and current != total:
+            return
+        
+        percent = current * self._pct_per_word
+        filled = min(50, int(current * self._bar_per_word))
         eta_str = self.calculate_eta()
+        if (filled, eta_str) == self._last_progress and current != total:
+            return
+        self._last_progress_time = now
+        self._last_progress = (filled, eta_str)
         
-        print(f'\r🚀 Progress: |{bar}| {current}/{total} ({percent:.1f}%) {eta_str}', end='', flush=True)
+        print(f'\r🚀 Progress: |{PROGRESS_BARS[filled]}| {current}/{total} ({percent:.1f}%) {eta_str}', end='', flush=True)
     
-    def process_batch_robustly(self, csv_files: List[str]):
+    async def process_batch_robustly(self, csv_files: List[str]):
         """Process batch with crash recovery and accurate progress."""
         
         print("🛡️ Starting Robust Batch Processing...")
@@ -232,10 +499,10 @@ class RobustBatchProcessor:
         
         # Load previous progress
         previous_progress = self.load_progress()
-        previously_processed = set(previous_progress.get('processed_words', []))
+        self._processed_set = set(previous_progress.get('processed_words', [])) | self.load_processed_words()
         
-        if previously_processed:
-            print(f"📋 Found previous progress: {len(previously_processed)} words already processed")
+        if self._processed_set:
+            print(f"📋 Found previous progress: {len(self._processed_set)} words already processed")
         
         # Load all selected words
         all_selected_words = self.load_selected_words(csv_files)
@@ -245,21 +512,17 @@ class RobustBatchProcessor:
         existing_flashcards = self.get_existing_flashcards()
         print(f"📚 Found {len(existing_flashcards)} existing flashcards")
         
-        # Filter words to process
-        words_to_process = []
-        for word in all_selected_words:
-            if word in self.sample_words:
-                continue  # Skip sample words
-            if word in existing_flashcards:
-                continue  # Skip existing flashcards
-            if word in previously_processed:
-                continue  # Skip already processed words
-            words_to_process.append(word)
+        # Filter words to process: skip sample words, existing flashcards and already processed words
+        skip = self.sample_words | existing_flashcards | self._processed_set
+        words_to_process = sorted(set(all_selected_words) - skip)
         
         self.total_words = len(words_to_process)
+        # Progress scale factors, computed once per batch instead of per redraw
+        self._pct_per_word = 100.0 / max(1, self.total_words)
+        self._bar_per_word = 50.0 / max(1, self.total_words)
         
         print(f"🎯 Words to process: {self.total_words}")
-        print(f"📊 Estimated time: {self.total_words * 90 / 3600:.1f} hours")
+        print(f"📊 Estimated time: {self.total_words * 90 / self.concurrency / 3600:.1f} hours")
         print()
         
         if self.total_words == 0:
@@ -269,43 +532,72 @@ class RobustBatchProcessor:
         # Start processing
         self.start_time = time.time()
         results = []
-        processed_in_session = []
         
-        for i, word in enumerate(words_to_process):
-            self.processed_words = i + 1
-            
-            # Display progress
-            self.display_progress(self.processed_words - 1, self.total_words)
-            
-            # Process the word
-            result = self.generate_flashcard(word)
-            results.append(result)
-            processed_in_session.append(word)
-            
-            # Show result
-            if result['status'] == 'success':
-                print(f"\n✅ {word}: Success ({result['processing_time']:.0f}s)")
-            else:
-                print(f"\n❌ {word}: {result['status']} ({result['processing_time']:.0f}s)")
-                if result['status'] == 'server_down':
-                    print("⚠️ Server appears to be down. Stopping batch processing.")
-                    break
-            
-            # Save progress every 10 words
-            if len(processed_in_session) % 10 == 0:
-                all_processed = list(previously_processed) + processed_in_session
-                self.save_progress(all_processed, results)
-                print(f"💾 Progress saved ({len(all_processed)} total processed)")
-            
-            # Brief pause to avoid overwhelming the server
-            time.sleep(1)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def generate_bounded(client: httpx.AsyncClient, chunk: List[str]) -> List[Dict]:
+            async with semaphore:
+                if len(chunk) == 1:
+                    chunk_results = [await self.generate_flashcard(client, chunk[0])]
+                else:
+                    chunk_results = await self.generate_flashcards_batch(client, chunk)
+                # Back off only while the server is throttling us
+                if any(result.get('http_status') in (429, 503) for result in chunk_results):
+                    self._consecutive_throttles += 1
+                    await asyncio.sleep(min(60, 2 ** self._consecutive_throttles))
+                elif any(result['status'] == 'success' for result in chunk_results):
+                    self._consecutive_throttles = 0
+                return chunk_results
         
-        # Final progress update
-        self.display_progress(self.processed_words, self.total_words)
+        limits = httpx.Limits(max_connections=self.concurrency * 2, keepalive_expiry=75)
+        with open(self.results_log_file, 'ab') as results_log:
+            async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+                chunks = [
+                    words_to_process[start:start + self.batch_size]
+                    for start in range(0, len(words_to_process), self.batch_size)
+                ]
+                tasks = [asyncio.create_task(generate_bounded(client, chunk)) for chunk in chunks]
+                
+                # Display progress
+                self.display_progress(0, self.total_words)
+                
+                try:
+                    # Handle results in completion order, still checkpointing per word
+                    server_down = False
+                    for completed in asyncio.as_completed(tasks):
+                        for result in await completed:
+                            word = result['word']
+                            self.processed_words += 1
+                            results.append(result)
+                            self._processed_set.add(word)
+                            self.display_progress(self.processed_words, self.total_words)
+                            
+                            # Checkpoint every word: one appended line plus a tiny summary
+                            self.append_result(results_log, result)
+                            self.save_summary(len(self._processed_set), word)
+                            
+                            # Show result
+                            if result['status'] == 'success':
+                                print(f"\n✅ {word}: Success ({result['processing_time']:.0f}s)")
+                            else:
+                                print(f"\n❌ {word}: {result['status']} ({result['processing_time']:.0f}s)")
+                                if result['status'] == 'server_down':
+                                    server_down = True
+                            
+                            if len(results) % 10 == 0:
+                                print(f"💾 Progress saved ({len(self._processed_set)} total processed)")
+                        
+                        if server_down:
+                            print("⚠️ Server appears to be down. Stopping batch processing.")
+                            break
+                finally:
+                    # Stop any words still queued or in flight (e.g. after the server went down)
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
         
         # Save final results
-        all_processed = list(previously_processed) + processed_in_session
-        self.save_progress(all_processed, results)
+        self.save_results()
         
         # Summary
         total_time = time.time() - self.start_time
@@ -313,7 +605,7 @@ class RobustBatchProcessor:
         print(f"⏰ Session time: {total_time/60:.1f} minutes")
         print(f"✅ Successful this session: {self.successful_words}")
         print(f"❌ Failed this session: {self.failed_words}")
-        print(f"📊 Total processed overall: {len(all_processed)}")
+        print(f"📊 Total processed overall: {len(self._processed_set)}")
         print(f"📄 Results saved to: {self.results_file}")
 
 def main():
@@ -323,7 +615,7 @@ def main():
     ]
     
     processor = RobustBatchProcessor()
-    processor.process_batch_robustly(csv_files)
+    asyncio.run(processor.process_batch_robustly(csv_files))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -16,12 +16,16 @@ def test_ai_generation():
     print("🧪 Testing AI Generation Integration")
     print("="*50)
     
+    # One session for all test words so they share a keep-alive connection
+    session = requests.Session()
+    
     for i, word in enumerate(test_words, 1):
         print(f"\n🔄 Testing word {i}/{len(test_words)}: {word}")
         start_time = time.time()
+        throttled = False
         
         try:
-            response = requests.post(
+            response = session.post(
                 f"{server_url}/api/ai/generate",
                 json={
                     "word_or_phrase": word,
@@ -43,14 +47,15 @@ def test_ai_generation():
             else:
                 print(f"❌ FAILED ({processing_time:.1f}s)")
                 print(f"  HTTP {response.status_code}: {response.text[:200]}")
+                throttled = response.status_code in (429, 503)
         
         except Exception as e:
             processing_time = time.time() - start_time
             print(f"❌ ERROR ({processing_time:.1f}s)")
             print(f"  {str(e)}")
         
-        # Brief pause between requests
-        if i < len(test_words):
+        # Pause between requests only when the server asked us to slow down
+        if throttled and i < len(test_words):
             time.sleep(2)
     
     print(f"\n✅ AI Generation Test Complete!")
@@ -1,36 +1,44 @@
+import uuid
+from contextlib import closing
+
 import pyodbc
 
-conn = pyodbc.connect(
+FRENCH_LANGUAGE_ID = uuid.UUID('9E4D5CA8-FFEC-47B9-9943-5F2DD1093593')
+GREEK_LANGUAGE_ID = uuid.UUID('21D23A9E-4EF7-4D53-AD17-371D164D0F0F')
+API_DEFAULT_LIMIT = 100
+
+# closing() guarantees the connection is released even if a query fails
+with closing(pyodbc.connect(
     'DRIVER={ODBC Driver 17 for SQL Server};'
     'SERVER=localhost\\SQLEXPRESS;'
     'DATABASE=LanguageLearning;'
-    'Trusted_Connection=yes;'
-)
-
-cursor = conn.cursor()
-
-# Count French cards
-cursor.execute("SELECT COUNT(*) FROM flashcards WHERE language_id = ?", '9E4D5CA8-FFEC-47B9-9943-5F2DD1093593')
-french_count = cursor.fetchone()[0]
-print(f"✅ Total French cards in DB: {french_count}")
+    'Trusted_Connection=yes;',
+    autocommit=True
+)) as conn, closing(conn.cursor()) as cursor:
 
-# Count Greek cards  
-cursor.execute("SELECT COUNT(*) FROM flashcards WHERE language_id = ?", '21D23A9E-4EF7-4D53-AD17-371D164D0F0F')
-greek_count = cursor.fetchone()[0]
-print(f"✅ Total Greek cards in DB: {greek_count}")
+    # Count French and Greek cards in one round-trip; UUID parameters bind as uniqueidentifier
+    cursor.execute("""
+        SELECT language_id, COUNT(*)
+        FROM flashcards
+        WHERE language_id IN (?, ?)
+        GROUP BY language_id
+    """, FRENCH_LANGUAGE_ID, GREEK_LANGUAGE_ID)
+    counts = {uuid.UUID(str(language_id)): count for language_id, count in cursor.fetchall()}
 
-# Get sample of what API would return (limited to 100 like the default)
-cursor.execute("""
-    SELECT TOP 100 id, word_or_phrase, language_id 
-    FROM flashcards 
-    WHERE language_id = ?
-    ORDER BY created_at DESC
-""", '9E4D5CA8-FFEC-47B9-9943-5F2DD1093593')
+    french_count = counts.get(FRENCH_LANGUAGE_ID, 0)
+    greek_count = counts.get(GREEK_LANGUAGE_ID, 0)
+    print(f"✅ Total French cards in DB: {french_count}")
+    print(f"✅ Total Greek cards in DB: {greek_count}")
 
-results = cursor.fetchall()
-print(f"\n📊 API would return (with limit=100): {len(results)} French cards")
-print(f"Sample cards:")
-for i, row in enumerate(results[:5]):
-    print(f"  {i+1}. {row.word_or_phrase}")
+    # Get sample of what API would return (limited to 100 like the default)
+    cursor.execute("""
+        SELECT TOP 5 id, word_or_phrase, language_id
+        FROM flashcards
+        WHERE language_id = ?
+        ORDER BY created_at DESC
+    """, FRENCH_LANGUAGE_ID)
 
-conn.close()
+    print(f"\n📊 API would return (with limit={API_DEFAULT_LIMIT}): {min(french_count, API_DEFAULT_LIMIT)} French cards")
+    print(f"Sample cards:")
+    for i, row in enumerate(cursor.fetchmany(5)):
+        print(f"  {i+1}. {row.word_or_phrase}")
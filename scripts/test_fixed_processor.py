@@ -6,6 +6,7 @@ Test Fixed Batch Processor - Test 3 words to verify the fix works
 import csv
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -19,6 +20,12 @@ class TestFixedProcessor:
         self.server_url = server_url
         self.french_lang_id = "9e4d5ca8-ffec-47b9-9943-5f2dd1093593"
         
+        # Shared HTTP session so every word reuses the same keep-alive connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         # Progress tracking
         self.total_words = 0
         self.processed_words = 0
@@ -33,7 +40,7 @@ class TestFixedProcessor:
         
         try:
             # Call the AI generation endpoint directly
-            response = requests.post(
+            response = self.session.post(
                 f"{self.server_url}/api/ai/generate",
                 json={
                     "word_or_phrase": word,
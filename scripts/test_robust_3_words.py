@@ -3,22 +3,74 @@
 Test the robust processor with just 3 words to verify it works
 """
 
+import asyncio
 import csv
 import json
+import httpx
+import itertools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Set
 import sys
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+def to_json_bytes(data, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, indent=2 if pretty else None, ensure_ascii=False).encode('utf-8')
+
+# Parse raw response bytes without decoding them to str first
+from_json = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 class RobustBatchProcessor:
     """Robust batch processor with crash recovery and accurate progress tracking."""
     
-    def __init__(self, server_url: str = "http://localhost:8000"):
+    # Seconds a /health probe result is reused, so concurrent connection errors share one probe
+    HEALTH_TTL = 5.0
+    
+    def __init__(self, server_url: str = "http://localhost:8000", concurrency: int = 3, batch_size: int = 8):
         self.server_url = server_url
+        self.concurrency = concurrency
+        # Words per /api/ai/batch-generate request; 1 uses the per-word /api/ai/generate endpoint
+        self.batch_size = batch_size
         self.french_lang_id = "9e4d5ca8-ffec-47b9-9943-5f2dd1093593"
+        # Static tail of every /api/ai/generate body, encoded once (leading '{' stripped)
+        self._generate_payload_suffix = to_json_bytes({
+            "language_id": self.french_lang_id,
+            "include_image": True
+        })[1:]
+        
+        # Shared HTTP session so every request reuses pooled keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504]
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
         # Progress tracking
         self.total_words = 0
@@ -26,17 +78,49 @@ class RobustBatchProcessor:
         self.successful_words = 0
         self.failed_words = 0
         self.start_time = None
-        self.processing_times = []
+        # (monotonic time, result) of the last /health probe
+        self._last_health = (float('-inf'), False)
+        # Only the last 5 processing times feed the ETA
+        self.processing_times = deque(maxlen=5)
+        # tqdm bar for the current run; None falls back to display_progress
+        self.pbar = None
         
         # Resume functionality
         self.progress_file = "Output/test_batch_progress.json"
-        self.results_file = "Output/test_batch_results.json"
+        self.results_file = "Output/test_batch_results.jsonl"
+        
+        # Append-only results log, one JSON line per word as it finishes;
+        # opened by __enter__ and closed by __exit__ (use the processor in a with block).
+        # Re-runs need no local result cache: _filter_new already skips words the server has
+        self.results_fp = None
         
         # Sample words to exclude
         self.sample_words = {
             'ailleurs', 'davantage', 'démonstratifs', 'éloges', 'parfois'
         }
     
+    def __enter__(self):
+        os.makedirs("Output", exist_ok=True)
+        self.results_fp = open(self.results_file, 'ab', buffering=0)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Release the pooled connections and close the results log."""
+        self.session.close()
+        if self.results_fp is not None:
+            self.results_fp.close()
+            self.results_fp = None
+    
+    def log(self, message: str):
+        """Print a line without breaking the tqdm bar."""
+        if self.pbar is not None:
+            self.pbar.write(message)
+        else:
+            print(message)
+    
     def load_progress(self) -> Dict:
         """Load previous progress if exists."""
         try:
@@ -47,8 +131,12 @@ class RobustBatchProcessor:
             print(f"⚠️ Could not load progress: {e}")
         return {}
     
+    def append_result(self, result: Dict):
+        """Append one word's result to the JSONL results log."""
+        self.results_fp.write(to_json_bytes(result) + b'\n')
+    
     def save_progress(self, processed_words: List[str], results: List[Dict]):
-        """Save current progress."""
+        """Save the progress summary; per-word results are already in the JSONL log."""
         try:
             progress = {
                 'timestamp': datetime.now().isoformat(),
@@ -57,67 +145,64 @@ class RobustBatchProcessor:
                 'successful': len([r for r in results if r['status'] == 'success']),
                 'failed': len([r for r in results if r['status'] != 'success'])
             }
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, indent=2)
-            
-            # Also save full results
-            with open(self.results_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            with open(self.progress_file, 'wb') as f:
+                f.write(to_json_bytes(progress, pretty=True))
                 
         except Exception as e:
             print(f"⚠️ Could not save progress: {e}")
     
     def check_server_health(self) -> bool:
-        """Check if server is responding."""
+        """Check if server is responding, reusing a probe from the last HEALTH_TTL seconds."""
+        checked_at, healthy = self._last_health
+        now = time.monotonic()
+        if now - checked_at < self.HEALTH_TTL:
+            return healthy
+        
         try:
-            response = requests.get(f"{self.server_url}/health", timeout=5)
-            return response.status_code == 200
+            response = self.session.get(f"{self.server_url}/health", timeout=5)
+            healthy = response.status_code == 200
         except:
-            return False
+            healthy = False
+        self._last_health = (now, healthy)
+        return healthy
     
-    def get_existing_flashcards(self) -> Set[str]:
-        """Get existing flashcard words."""
+    def _filter_new(self, words: List[str]) -> List[str]:
+        """Return the words that have no flashcard yet, asking the server about just these words."""
         try:
-            response = requests.get(f"{self.server_url}/api/flashcards/?language_id={self.french_lang_id}")
+            response = self.session.post(
+                f"{self.server_url}/api/flashcards/exists",
+                json={"language_id": self.french_lang_id, "words": words},
+                timeout=30
+            )
             if response.status_code == 200:
-                flashcards = response.json()
-                return {card['word_or_phrase'].lower() for card in flashcards}
+                existing = set(from_json(response.content).get('existing', []))
+                print(f"📚 Found {len(existing)} of {len(words)} words already in flashcards")
+                return [word for word in words if word.lower() not in existing]
+            print(f"❌ Error checking existing flashcards: HTTP {response.status_code}")
         except Exception as e:
-            print(f"❌ Error fetching existing flashcards: {e}")
-        return set()
+            print(f"❌ Error checking existing flashcards: {e}")
+        return list(words)
     
-    def generate_flashcard(self, word: str) -> Dict:
+    async def generate_flashcard(self, client: httpx.AsyncClient, word: str) -> Dict:
         """Generate a single flashcard with comprehensive error handling."""
-        word_start_time = time.time()
+        word_start_time = time.perf_counter()
         
         try:
-            print(f"🔄 Processing '{word}'...")
-            
-            # Check server health first
-            if not self.check_server_health():
-                return {
-                    'word': word,
-                    'status': 'server_down',
-                    'processing_time': time.time() - word_start_time,
-                    'error': 'Server is not responding'
-                }
+            self.log(f"🔄 Processing '{word}'...")
             
             # Make the AI generation request
-            response = requests.post(
+            response = await client.post(
                 f"{self.server_url}/api/ai/generate",
-                json={
-                    "word_or_phrase": word,
-                    "language_id": self.french_lang_id,
-                    "include_image": True
-                },
+                content=b'{"word_or_phrase":' + to_json_bytes(word) + b',' + self._generate_payload_suffix,
+                headers={"Content-Type": "application/json"},
                 timeout=300  # 5 minute timeout
             )
             
-            processing_time = time.time() - word_start_time
+            processing_time = time.perf_counter() - word_start_time
             self.processing_times.append(processing_time)
             
             if response.status_code == 200:
-                result = response.json()
+                result = from_json(response.content)
                 self.successful_words += 1
                 return {
                     'word': word,
@@ -138,8 +223,8 @@ class RobustBatchProcessor:
                     'error': f"HTTP {response.status_code}: {error_text}"
                 }
                 
-        except requests.exceptions.Timeout:
-            processing_time = time.time() - word_start_time
+        except httpx.TimeoutException:
+            processing_time = time.perf_counter() - word_start_time
             self.processing_times.append(processing_time)
             self.failed_words += 1
             return {
@@ -148,9 +233,17 @@ class RobustBatchProcessor:
                 'processing_time': processing_time,
                 'error': 'Request timed out after 5 minutes'
             }
-        except requests.exceptions.ConnectionError:
-            processing_time = time.time() - word_start_time
+        except httpx.NetworkError:
+            processing_time = time.perf_counter() - word_start_time
             self.failed_words += 1
+            # Only a dropped connection warrants a fresh health probe
+            if not await asyncio.to_thread(self.check_server_health):
+                return {
+                    'word': word,
+                    'status': 'server_down',
+                    'processing_time': processing_time,
+                    'error': 'Server is not responding'
+                }
             return {
                 'word': word,
                 'status': 'connection_error',
@@ -158,7 +251,7 @@ class RobustBatchProcessor:
                 'error': 'Connection lost to server'
             }
         except Exception as e:
-            processing_time = time.time() - word_start_time
+            processing_time = time.perf_counter() - word_start_time
             self.processing_times.append(processing_time)
             self.failed_words += 1
             return {
@@ -168,13 +261,66 @@ class RobustBatchProcessor:
                 'error': str(e)
             }
     
+    async def generate_flashcards_batch(self, client: httpx.AsyncClient, words: List[str]) -> List[Dict]:
+        """Generate several flashcards in one /api/ai/batch-generate request, one result per word."""
+        batch_start_time = time.perf_counter()
+        
+        status, error, word_results = 'error', None, {}
+        try:
+            self.log(f"🔄 Processing {', '.join(words)}...")
+            
+            response = await client.post(
+                f"{self.server_url}/api/ai/batch-generate",
+                json={
+                    "words": words,
+                    "language_id": self.french_lang_id,
+                    "include_images": True
+                },
+                timeout=300 * len(words)  # The server generates the batch one word at a time
+            )
+            if response.status_code == 200:
+                word_results = {item['word']: item for item in from_json(response.content).get('word_results', [])}
+                status = 'success'
+            else:
+                error_text = response.text[:200] if response.text else 'Unknown error'
+                status, error = 'failed', f"HTTP {response.status_code}: {error_text}"
+        except httpx.TimeoutException:
+            status, error = 'timeout', f"Batch request timed out after {5 * len(words)} minutes"
+        except httpx.NetworkError:
+            status, error = 'connection_error', 'Connection lost to server'
+            if not await asyncio.to_thread(self.check_server_health):
+                status, error = 'server_down', 'Server is not responding'
+        except Exception as e:
+            error = str(e)
+        
+        # Spread the batch time evenly so the ETA stays per word
+        processing_time = (time.perf_counter() - batch_start_time) / len(words)
+        results = []
+        for word in words:
+            self.processing_times.append(processing_time)
+            result = {'word': word, 'processing_time': processing_time}
+            word_result = word_results.get(word)
+            if word_result and word_result.get('status') == 'success':
+                self.successful_words += 1
+                result.update({'status': 'success', 'flashcard_id': word_result.get('flashcard_id')})
+            else:
+                self.failed_words += 1
+                if status == 'success':
+                    result.update({
+                        'status': 'failed',
+                        'error': word_result.get('error') if word_result else 'Missing from batch response'
+                    })
+                else:
+                    result.update({'status': status, 'error': error})
+            results.append(result)
+        return results
+    
     def calculate_eta(self) -> str:
         """Calculate ETA based on recent processing times."""
         if len(self.processing_times) < 2:
             return "Calculating ETA..."
         
-        recent_times = self.processing_times[-5:]
-        avg_time = sum(recent_times) / len(recent_times)
+        avg_time = sum(self.processing_times) / len(self.processing_times)
         remaining_words = self.total_words - self.processed_words
         estimated_seconds = remaining_words * avg_time
         
@@ -199,24 +345,22 @@ class RobustBatchProcessor:
         
         print(f'\r🚀 Progress: |{bar}| {current}/{total} ({percent:.1f}%) {eta_str}', end='', flush=True)
     
-    def test_3_words(self):
+    async def test_3_words_async(self):
         """Test with just 3 words to verify the system works."""
         
         print("🧪 Testing Robust Batch Processing with 3 words...")
         print("="*60)
         
+        # Probe the server once up front instead of before every word
+        if not self.check_server_health():
+            print("❌ Server is not responding")
+            return
+        
         # Test with 3 specific words
         test_words = ['aborder', 'aboutir', 'accorder']
         
-        # Get existing flashcards
-        existing_flashcards = self.get_existing_flashcards()
-        print(f"📚 Found {len(existing_flashcards)} existing flashcards")
-        
-        # Filter words to process
-        words_to_process = []
-        for word in test_words:
-            if word not in existing_flashcards:
-                words_to_process.append(word)
+        # Filter out words that already have flashcards
+        words_to_process = self._filter_new(test_words)
         
         self.total_words = len(words_to_process)
         
@@ -229,33 +373,55 @@ class RobustBatchProcessor:
             return
         
         # Start processing
-        self.start_time = time.time()
-        results = []
-        processed_in_session = []
+        self.start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
         
-        for i, word in enumerate(words_to_process):
-            self.processed_words = i + 1
+        async def _gen(client: httpx.AsyncClient, chunk: List[str]) -> List[Dict]:
+            async with semaphore:
+                if len(chunk) == 1:
+                    chunk_results = [await self.generate_flashcard(client, chunk[0])]
+                else:
+                    chunk_results = await self.generate_flashcards_batch(client, chunk)
             
-            # Process the word
-            result = self.generate_flashcard(word)
-            results.append(result)
-            processed_in_session.append(word)
-            
-            # Show result
-            if result['status'] == 'success':
-                print(f"✅ {word}: Success ({result['processing_time']:.0f}s)")
-            else:
-                print(f"❌ {word}: {result['status']} ({result['processing_time']:.0f}s)")
-            
-            # Display progress
-            self.display_progress(self.processed_words, self.total_words)
-            print()  # New line after progress bar
+            for result in chunk_results:
+                self.processed_words += 1
+                self.append_result(result)
+                
+                # Show result
+                if result['status'] == 'success':
+                    self.log(f"✅ {result['word']}: Success ({result['processing_time']:.0f}s)")
+                else:
+                    self.log(f"❌ {result['word']}: {result['status']} ({result['processing_time']:.0f}s)")
+                
+                # Display progress; tqdm throttles its own redraws and computes the ETA
+                if self.pbar is not None:
+                    self.pbar.update(1)
+                else:
+                    self.display_progress(self.processed_words, self.total_words)
+                    print()  # New line after progress bar
+            return chunk_results
+        
+        # Submit the words in chunks of batch_size, up to `concurrency` chunks at the same time
+        words_iter = iter(words_to_process)
+        chunks = list(iter(lambda: list(itertools.islice(words_iter, self.batch_size)), []))
+        limits = httpx.Limits(max_connections=self.concurrency)
+        if TQDM_AVAILABLE:
+            self.pbar = tqdm(total=self.total_words, unit="word", smoothing=0.3)
+        try:
+            async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(300.0)) as client:
+                chunk_results = await asyncio.gather(*[_gen(client, chunk) for chunk in chunks])
+        finally:
+            if self.pbar is not None:
+                self.pbar.close()
+                self.pbar = None
+        results = [result for chunk in chunk_results for result in chunk]
+        processed_in_session = [result['word'] for result in results]
         
         # Save final results
         self.save_progress(processed_in_session, results)
         
         # Summary
-        total_time = time.time() - self.start_time
+        total_time = time.perf_counter() - self.start_time
         print(f"\n🎯 TEST RESULTS:")
         print(f"⏰ Total time: {total_time/60:.1f} minutes")
         print(f"✅ Successful: {self.successful_words}")
@@ -263,8 +429,8 @@ class RobustBatchProcessor:
         print(f"📄 Results saved to: {self.results_file}")
 
 def main():
-    processor = RobustBatchProcessor()
-    processor.test_3_words()
+    with RobustBatchProcessor() as processor:
+        asyncio.run(processor.test_3_words_async())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -17,7 +17,7 @@ def test_single_word():
     print(f"Testing AI generation for word: '{test_word}'")
     print("="*50)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Make the AI generation request
@@ -31,7 +31,7 @@ def test_single_word():
             timeout=300  # 5 minute timeout
         )
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         print(f"Response status: {response.status_code}")
         print(f"Processing time: {processing_time:.1f} seconds")
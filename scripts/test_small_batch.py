@@ -3,11 +3,12 @@
 Small Test Batch - Process 5 words to verify system works before full batch
 """
 
-import requests
+import asyncio
+import httpx
 import time
 from datetime import datetime
 
-def test_small_batch():
+async def test_small_batch(concurrency: int = 5):
     """Test with 5 words to verify full AI generation works."""
     
     server_url = "http://localhost:8000"
@@ -19,60 +20,89 @@ def test_small_batch():
     print("="*50)
     print(f"⏰ Start time: {datetime.now().strftime('%H:%M:%S')}")
     print(f"📝 Words to process: {', '.join(test_words)}")
-    print(f"⏱️ Expected time: ~{len(test_words) * 2.5:.0f} minutes")
+    print(f"⏱️ Expected time: ~{-(-len(test_words) // concurrency) * 2.5:.0f} minutes")
     print()
     
+    total_start = time.perf_counter()
+    completed = 0
+    finished_times = []
     results = []
-    total_start = time.time()
     
-    for i, word in enumerate(test_words, 1):
-        print(f"\n🔄 Processing {i}/{len(test_words)}: {word}")
-        word_start = time.time()
+    async def _gen(client: httpx.AsyncClient, word: str) -> dict:
+        nonlocal completed
+        print(f"\n🔄 Processing: {word}")
+        word_start = time.perf_counter()
         
         try:
-            response = requests.post(
+            response = await client.post(
                 f"{server_url}/api/ai/generate",
                 json={
                     "word_or_phrase": word,
                     "language_id": "9e4d5ca8-ffec-47b9-9943-5f2dd1093593",
                     "include_image": True
-                },
-                timeout=300  # 5 minute timeout per word
+                }
             )
             
-            word_time = time.time() - word_start
+            word_time = time.perf_counter() - word_start
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"✅ SUCCESS ({word_time:.0f}s)")
+                print(f"✅ {word}: SUCCESS ({word_time:.0f}s)")
                 print(f"   📄 Definition: {len(result.get('definition', ''))} chars")
                 print(f"   🖼️ Image: {'Yes' if result.get('image_url') else 'No'}")
-                results.append({'word': word, 'status': 'success', 'time': word_time})
+                status = 'success'
             else:
-                print(f"❌ FAILED ({word_time:.0f}s) - HTTP {response.status_code}")
-                results.append({'word': word, 'status': 'failed', 'time': word_time})
+                print(f"❌ {word}: FAILED ({word_time:.0f}s) - HTTP {response.status_code}")
+                status = 'failed'
         
-        except requests.exceptions.Timeout:
-            word_time = time.time() - word_start
-            print(f"⏰ TIMEOUT ({word_time:.0f}s)")
-            results.append({'word': word, 'status': 'timeout', 'time': word_time})
+        except httpx.TimeoutException:
+            word_time = time.perf_counter() - word_start
+            print(f"⏰ {word}: TIMEOUT ({word_time:.0f}s)")
+            status = 'timeout'
         
         except Exception as e:
-            word_time = time.time() - word_start
-            print(f"❌ ERROR ({word_time:.0f}s): {str(e)[:100]}")
-            results.append({'word': word, 'status': 'error', 'time': word_time})
+            word_time = time.perf_counter() - word_start
+            print(f"❌ {word}: ERROR ({word_time:.0f}s): {str(e)[:100]}")
+            status = 'error'
         
         # Show progress
-        completed = i
-        remaining = len(test_words) - i
-        avg_time = sum([r['time'] for r in results]) / len(results)
-        eta_minutes = (remaining * avg_time) / 60
+        completed += 1
+        finished_times.append(word_time)
+        remaining = len(test_words) - completed
+        avg_time = sum(finished_times) / len(finished_times)
+        eta_minutes = (remaining * avg_time) / concurrency / 60
         
         if remaining > 0:
             print(f"⏳ Progress: {completed}/{len(test_words)} | ETA: {eta_minutes:.1f} minutes")
+        return {'word': word, 'status': status, 'time': word_time}
+    
+    async def worker(queue: asyncio.Queue, client: httpx.AsyncClient):
+        # Pull words until the None sentinel arrives
+        while (word := await queue.get()) is not None:
+            try:
+                results.append(await _gen(client, word))
+            finally:
+                queue.task_done()
+        queue.task_done()
+    
+    # A fixed pool of workers bounds concurrency; each word still gets the 5 minute timeout
+    queue = asyncio.Queue()
+    for word in test_words:
+        queue.put_nowait(word)
+    
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(300.0)) as client:
+        workers = [
+            asyncio.create_task(worker(queue, client))
+            for _ in range(min(len(test_words), concurrency))
+        ]
+        await queue.join()
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
     
     # Final summary
-    total_time = time.time() - total_start
+    total_time = time.perf_counter() - total_start
     successful = len([r for r in results if r['status'] == 'success'])
     
     print(f"\n🎯 FINAL RESULTS:")
@@ -87,4 +117,4 @@ def test_small_batch():
         print(f"\n⚠️ Some failures detected. Check issues before running full batch.")
 
 if __name__ == "__main__":
-    test_small_batch()
\ No newline at end of file
+    asyncio.run(test_small_batch())
\ No newline at end of file
@@ -5,12 +5,17 @@ Tests critical functionality after deployment to catch issues before users do.
 import requests
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 
 # Configuration
 PRODUCTION_URL = "https://learn.rentyourcio.com"
 STAGING_URL = "https://super-flashcards-57478301787.us-central1.run.app"
 
+# Sentinels matched against raw response bytes, so bodies are never decoded
+_TITLE_TOKEN = b"Super-Flashcards"
+_DB_TOKENS = (b'login failed', b'connection', b'database', b'sql')
+
 class DeploymentTester:
     def __init__(self, base_url):
         self.base_url = base_url.rstrip('/')
@@ -23,7 +28,8 @@ class DeploymentTester:
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Room for every concurrent check to hold its own pooled connection
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         self.passed = 0
@@ -47,45 +53,49 @@ class DeploymentTester:
         try:
             response = self.session.get(f"{self.base_url}/health", timeout=10)
             passed = response.status_code == 200
-            self.log_test(
-                "Health Check", 
+            return (
+                "Health Check",
                 passed,
                 f"Status: {response.status_code}"
             )
-            return passed
         except Exception as e:
-            self.log_test("Health Check", False, f"Error: {e}")
-            return False
+            return ("Health Check", False, f"Error: {e}")
     
     def test_frontend_loads(self):
         """Test 2: Frontend HTML loads"""
         try:
             response = self.session.get(f"{self.base_url}/", timeout=10)
-            passed = response.status_code == 200 and "Super-Flashcards" in response.text
-            self.log_test(
+            has_title = _TITLE_TOKEN in response.content
+            passed = response.status_code == 200 and has_title
+            return (
                 "Frontend Loads",
                 passed,
-                f"Status: {response.status_code}, Contains title: {'Super-Flashcards' in response.text}"
+                f"Status: {response.status_code}, Contains title: {has_title}"
             )
-            return passed
         except Exception as e:
-            self.log_test("Frontend Loads", False, f"Error: {e}")
-            return False
+            return ("Frontend Loads", False, f"Error: {e}")
     
     def test_static_assets(self):
         """Test 3: Static JavaScript loads"""
         try:
-            response = self.session.get(f"{self.base_url}/static/app.js", timeout=10)
-            passed = response.status_code == 200 and len(response.content) > 1000
-            self.log_test(
+            # Only the size matters, so ask for headers rather than the whole bundle
+            url = f"{self.base_url}/static/app.js"
+            response = self.session.head(url, timeout=10)
+            content_length = response.headers.get("Content-Length")
+            if response.status_code in (405, 501) or content_length is None:
+                # No HEAD support, or a chunked/compressed response without a length: count the body
+                with self.session.get(url, stream=True, timeout=10) as response:
+                    size = sum(len(chunk) for chunk in response.iter_content(chunk_size=65536))
+            else:
+                size = int(content_length)
+            passed = response.status_code == 200 and size > 1000
+            return (
                 "Static Assets (app.js)",
                 passed,
-                f"Status: {response.status_code}, Size: {len(response.content)} bytes"
+                f"Status: {response.status_code}, Size: {size} bytes"
             )
-            return passed
         except Exception as e:
-            self.log_test("Static Assets", False, f"Error: {e}")
-            return False
+            return ("Static Assets", False, f"Error: {e}")
     
     def test_api_languages(self):
         """Test 4: API languages endpoint (requires DB)"""
@@ -96,21 +106,20 @@ class DeploymentTester:
             if passed:
                 languages = response.json()
                 passed = isinstance(languages, list) and len(languages) > 0
-                self.log_test(
+                result = (
                     "API Languages Endpoint",
                     passed,
                     f"Status: {response.status_code}, Languages found: {len(languages) if isinstance(languages, list) else 0}"
                 )
             else:
-                self.log_test(
+                result = (
                     "API Languages Endpoint",
                     False,
                     f"Status: {response.status_code}, Response: {response.text[:200]}"
                 )
-            return passed
+            return result
         except Exception as e:
-            self.log_test("API Languages Endpoint", False, f"Error: {e}")
-            return False
+            return ("API Languages Endpoint", False, f"Error: {e}")
     
     def test_oauth_redirect(self):
         """Test 5: OAuth redirect initiates correctly"""
@@ -133,22 +142,21 @@ class DeploymentTester:
                 
                 passed = google_oauth and has_state and has_redirect_uri
                 
-                self.log_test(
+                result = (
                     "OAuth Redirect",
                     passed,
                     f"Status: {response.status_code}, Redirects to Google: {google_oauth}, Has state: {has_state}, Has redirect_uri: {has_redirect_uri}"
                 )
             else:
-                self.log_test(
+                result = (
                     "OAuth Redirect",
                     False,
                     f"Status: {response.status_code}, Expected 302/307 redirect"
                 )
             
-            return passed
+            return result
         except Exception as e:
-            self.log_test("OAuth Redirect", False, f"Error: {e}")
-            return False
+            return ("OAuth Redirect", False, f"Error: {e}")
     
     def test_oauth_callback_route(self):
         """Test 6: OAuth callback route exists (will fail without valid state, but shouldn't 404)"""
@@ -162,16 +170,13 @@ class DeploymentTester:
             # Should NOT be 404 - any other error (400, 401, 500) means route exists
             passed = response.status_code != 404
             
-            self.log_test(
+            return (
                 "OAuth Callback Route Exists",
                 passed,
                 f"Status: {response.status_code} (404 = route missing, anything else = route exists)"
             )
-            
-            return passed
         except Exception as e:
-            self.log_test("OAuth Callback Route Exists", False, f"Error: {e}")
-            return False
+            return ("OAuth Callback Route Exists", False, f"Error: {e}")
     
     def test_database_connection(self):
         """Test 7: Database connection works (via languages endpoint)"""
@@ -182,27 +187,25 @@ class DeploymentTester:
             if response.status_code == 200:
                 languages = response.json()
                 passed = len(languages) > 0
-                self.log_test(
+                result = (
                     "Database Connection",
                     passed,
                     f"Successfully retrieved {len(languages)} languages from database"
                 )
             else:
                 # Check if error is database-related
-                error_text = response.text.lower()
-                is_db_error = any(keyword in error_text for keyword in ['login failed', 'connection', 'database', 'sql'])
+                error_prefix = response.content[:4096].lower()
+                is_db_error = any(token in error_prefix for token in _DB_TOKENS)
                 
-                self.log_test(
+                result = (
                     "Database Connection",
                     False,
-                    f"Database error detected: {response.text[:200]}"
+                    f"{'Database error detected' if is_db_error else 'Unexpected response'}: {response.text[:200]}"
                 )
-                passed = False
             
-            return passed
+            return result
         except Exception as e:
-            self.log_test("Database Connection", False, f"Error: {e}")
-            return False
+            return ("Database Connection", False, f"Error: {e}")
     
     def run_all_tests(self):
         """Run complete test suite"""
@@ -213,14 +216,21 @@ class DeploymentTester:
         print("="*80)
         print()
         
-        # Run tests in order
-        self.test_health_check()
-        self.test_frontend_loads()
-        self.test_static_assets()
-        self.test_database_connection()
-        self.test_api_languages()
-        self.test_oauth_redirect()
-        self.test_oauth_callback_route()
+        # The checks hit independent endpoints, so run them all at once
+        tests = [
+            self.test_health_check,
+            self.test_frontend_loads,
+            self.test_static_assets,
+            self.test_database_connection,
+            self.test_api_languages,
+            self.test_oauth_redirect,
+            self.test_oauth_callback_route,
+        ]
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(test) for test in tests]
+            # Report in submission order so the output reads the same on every run
+            for future in futures:
+                self.log_test(*future.result())
         
         # Summary
         print("="*80)
@@ -7,17 +7,38 @@ import sys
 # Get the key from Secret Manager (same way the deployment does)
 import subprocess
 
-try:
-    result = subprocess.run(
-        ['gcloud', 'secrets', 'versions', 'access', 'latest', 
-         '--secret=openai-api-key', '--project=super-flashcards-475210'],
-        capture_output=True,
-        text=True,
-        check=True
-    )
-    api_key = result.stdout.strip()
-    print(f"✓ Retrieved API key from Secret Manager: {api_key[:20]}...")
+PROJECT_ID = "super-flashcards-475210"
+SECRET_ID = "openai-api-key"
+
+def get_api_key() -> str:
+    """Read the key through the Secret Manager client, or the gcloud CLI if the library is missing."""
+    try:
+        from google.cloud import secretmanager
+    except ImportError:
+        result = subprocess.run(
+            ['gcloud', 'secrets', 'versions', 'access', 'latest',
+             f'--secret={SECRET_ID}', f'--project={PROJECT_ID}'],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
     
+    client = secretmanager.SecretManagerServiceClient()
+    name = client.secret_version_path(PROJECT_ID, SECRET_ID, "latest")
+    response = client.access_secret_version(request={"name": name})
+    return response.payload.data.decode("UTF-8").strip()
+
+try:
+    api_key = get_api_key()
+except Exception as e:
+    print(f"❌ ERROR: Failed to retrieve API key from Secret Manager")
+    print(f"Error: {getattr(e, 'stderr', None) or e}")
+    sys.exit(1)
+
+print(f"✓ Retrieved API key from Secret Manager: {api_key[:20]}...")
+
+try:
     # Test the API key with OpenAI
     from openai import OpenAI
     
@@ -39,11 +60,6 @@ try:
     print(f"✓ OpenAI API Response: {content}")
     print("\n✅ SUCCESS: OpenAI API key is working correctly!")
     
-except subprocess.CalledProcessError as e:
-    print(f"❌ ERROR: Failed to retrieve API key from Secret Manager")
-    print(f"Error: {e.stderr}")
-    sys.exit(1)
-    
 except Exception as e:
     print(f"❌ ERROR: OpenAI API call failed")
     print(f"Error Type: {type(e).__name__}")
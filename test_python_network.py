@@ -1,63 +1,78 @@
 """
 Quick test to diagnose Python's slow HTTPS requests
 """
+import argparse
 import time
 import httpx
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+parser = argparse.ArgumentParser(description="Diagnose slow HTTPS requests from Python")
+parser.add_argument(
+    "--target",
+    default="https://accounts.google.com/.well-known/openid-configuration",
+    help="URL to probe (default: Google OAuth config)"
+)
+parser.add_argument(
+    "--full",
+    action="store_true",
+    help="Also probe with HTTP/2 enabled (needs h2) and with SSL verification disabled"
+)
+args = parser.parse_args()
+
 print("Testing Python's network performance...")
 print("=" * 60)
 
-# Test 1: Simple DNS resolution via httpx
-print("\n1. Testing httpx GET request to Google OAuth config:")
-start = time.time()
-try:
-    with httpx.Client(timeout=30.0) as client:
-        response = client.get("https://accounts.google.com/.well-known/openid-configuration")
-        elapsed = time.time() - start
-        print(f"   ✅ Success in {elapsed:.2f} seconds")
-        print(f"   Status: {response.status_code}")
-except Exception as e:
-    elapsed = time.time() - start
-    print(f"   ❌ Failed after {elapsed:.2f} seconds")
-    print(f"   Error: {e}")
-
-# Test 2: With HTTP/2 disabled
-print("\n2. Testing httpx with HTTP/2 disabled:")
-start = time.time()
-try:
-    with httpx.Client(timeout=30.0, http2=False) as client:
-        response = client.get("https://accounts.google.com/.well-known/openid-configuration")
-        elapsed = time.time() - start
-        print(f"   ✅ Success in {elapsed:.2f} seconds")
-        print(f"   Status: {response.status_code}")
-except Exception as e:
-    elapsed = time.time() - start
-    print(f"   ❌ Failed after {elapsed:.2f} seconds")
-    print(f"   Error: {e}")
-
-# Test 3: With SSL verification disabled
-print("\n3. Testing httpx with SSL verification disabled:")
-start = time.time()
-try:
-    with httpx.Client(timeout=30.0, verify=False) as client:
-        response = client.get("https://accounts.google.com/.well-known/openid-configuration")
-        elapsed = time.time() - start
-        print(f"   ✅ Success in {elapsed:.2f} seconds")
-        print(f"   Status: {response.status_code}")
-except Exception as e:
-    elapsed = time.time() - start
-    print(f"   ❌ Failed after {elapsed:.2f} seconds")
-    print(f"   Error: {e}")
-
-# Test 4: Check for proxy settings
-print("\n4. Checking environment proxy settings:")
+URL = args.target
+
+def run_probe(label, client_factory, runs=1):
+    """GET URL `runs` times on one client from client_factory; returns (label, run, elapsed_ms, outcome) rows."""
+    rows = []
+    with client_factory() as client:
+        for run in range(1, runs + 1):
+            start = time.perf_counter_ns()
+            try:
+                response = client.get(URL)
+                outcome = (True, f"{response.status_code} ({response.http_version})")
+            except Exception as e:
+                outcome = (False, str(e))
+            rows.append((label, run, (time.perf_counter_ns() - start) / 1e6, outcome))
+    return rows
+
+limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+# Baseline stays on httpx's default HTTP/1.1 so results compare across machines whatever is installed.
+# Run 1 pays for DNS + TCP + TLS; run 2 reuses the warm connection
+results = run_probe(f"httpx GET request to {URL} (HTTP/1.1)",
+                    lambda: httpx.Client(timeout=30.0, limits=limits), runs=2)
+if args.full:
+    if HTTP2_AVAILABLE:
+        results += run_probe("httpx with HTTP/2 enabled", lambda: httpx.Client(timeout=30.0, http2=True))
+    else:
+        print("\nℹ️ Skipping the HTTP/2 probe: pip install h2 to enable it")
+    results += run_probe("httpx with SSL verification disabled", lambda: httpx.Client(timeout=30.0, verify=False))
+
+# Format everything after the timed section
+for i, (label, run, elapsed_ms, (ok, detail)) in enumerate(results, 1):
+    connection = "new connection" if run == 1 else "warm connection"
+    print(f"\n{i}. Testing {label} ({connection}):")
+    if ok:
+        print(f"   ✅ Success in {elapsed_ms:.1f} ms")
+        print(f"   Status: {detail}")
+    else:
+        print(f"   ❌ Failed after {elapsed_ms:.1f} ms")
+        print(f"   Error: {detail}")
+
+# Last: Check for proxy settings
+print(f"\n{len(results) + 1}. Checking environment proxy settings:")
 import os
-http_proxy = os.environ.get('HTTP_PROXY') or os.environ.get('http_proxy')
-https_proxy = os.environ.get('HTTPS_PROXY') or os.environ.get('https_proxy')
-no_proxy = os.environ.get('NO_PROXY') or os.environ.get('no_proxy')
-print(f"   HTTP_PROXY: {http_proxy or 'Not set'}")
-print(f"   HTTPS_PROXY: {https_proxy or 'Not set'}")
-print(f"   NO_PROXY: {no_proxy or 'Not set'}")
+env = os.environ
+proxies = {name: env.get(name) or env.get(name.lower()) for name in ("HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY")}
+for name, value in proxies.items():
+    print(f"   {name}: {value or 'Not set'}")
 
 print("\n" + "=" * 60)
 print("Test complete!")
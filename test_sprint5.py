@@ -4,32 +4,70 @@ Sprint 5 Phase 1 - Local Network Testing Script
 Test offline sync functionality across devices (laptop ↔ iPhone)
 """
 
+import asyncio
+import functools
+import http.client
+import httpx
+import os
 import subprocess
 import sys
 import socket
 import time
-import requests
 from pathlib import Path
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# FC_TEST_VERBOSE=1 shows server logs and runs uvicorn with --reload
+VERBOSE = bool(os.environ.get("FC_TEST_VERBOSE"))
+
+def _child_process_kwargs():
+    """Popen options for the servers: own session group, output discarded unless verbose."""
+    if VERBOSE:
+        return {"start_new_session": True}
+    return {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "start_new_session": True}
+
+# Resolve each host once per run; the startup poll and endpoint sweep hit the same hosts repeatedly
+_uncached_getaddrinfo = socket.getaddrinfo
+
+@functools.lru_cache(maxsize=256)
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    return _uncached_getaddrinfo(host, port, family, type, proto, flags)
+
+def _getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    return _cached_getaddrinfo(host, port, family, type, proto, flags)
+
+socket.getaddrinfo = _getaddrinfo
+
+@functools.lru_cache(maxsize=1)
 def get_local_ip():
-    """Get the local network IP address"""
+    """Get the local network IP address (computed once per run)"""
     try:
-        # Connect to a remote address to determine local IP
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
+        # Connecting a UDP socket only picks a route; no packet is sent
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.setblocking(False)
+            try:
+                s.connect(("8.8.8.8", 80))
+            except BlockingIOError:
+                pass
+            return s.getsockname()[0]
     except:
         return "localhost"
 
-def check_backend_running():
+def check_backend_running(timeout=0.5):
     """Check if the FastAPI backend is running"""
+    # 127.0.0.1 skips the IPv6 attempt and hosts-file lookup for localhost
+    conn = http.client.HTTPConnection("127.0.0.1", 8000, timeout=timeout)
     try:
-        response = requests.get("http://localhost:8000/health", timeout=5)
-        return response.status_code == 200
-    except:
+        conn.request("GET", "/health")
+        return conn.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
         return False
+    finally:
+        conn.close()
 
 def start_backend():
     """Start the FastAPI backend"""
@@ -38,20 +76,23 @@ def start_backend():
     
     # Start backend in background
     process = subprocess.Popen([
-        sys.executable, "-m", "uvicorn", 
-        "app.main:app", 
-        "--reload", 
-        "--host", "0.0.0.0", 
+        sys.executable, "-m", "uvicorn",
+        "app.main:app",
+        *(["--reload"] if VERBOSE else []),
+        "--host", "0.0.0.0",
         "--port", "8000"
-    ], cwd=backend_path)
+    ], cwd=backend_path, **_child_process_kwargs())
     
-    # Wait for backend to start
-    for i in range(30):  # Wait up to 30 seconds
+    # Wait up to 30 seconds, polling quickly at first and backing off to 0.5s
+    print("⏳ Waiting for backend to start...")
+    deadline = time.monotonic() + 30
+    delay = 0.025
+    while time.monotonic() < deadline:
         if check_backend_running():
             print("✅ Backend started successfully")
             return process
-        time.sleep(1)
-        print(f"⏳ Waiting for backend to start... ({i+1}/30)")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
     
     print("❌ Backend failed to start")
     return None
@@ -64,12 +105,45 @@ def start_frontend():
     # Start frontend in background
     process = subprocess.Popen([
         sys.executable, "-m", "http.server", "3000"
-    ], cwd=frontend_path)
+    ], cwd=frontend_path, **_child_process_kwargs())
     
     time.sleep(2)  # Give it a moment to start
     print("✅ Frontend started successfully")
     return process
 
+async def probe_endpoints(local_ip):
+    """Health check plus API endpoint checks, all requested at the same time."""
+    endpoints = [
+        "/health",
+        "/api/flashcards",
+        "/api/languages",
+        "/api/tts/voices"
+    ]
+    
+    async with httpx.AsyncClient(base_url=f"http://{local_ip}:8000", http2=HTTP2_AVAILABLE, timeout=5.0) as client:
+        responses = await asyncio.gather(
+            *(client.get(endpoint) for endpoint in endpoints),
+            return_exceptions=True
+        )
+    
+    # Test 1: Health Check
+    health = responses[0]
+    if isinstance(health, Exception):
+        print(f"   ❌ Health check error: {health}")
+    elif health.status_code == 200:
+        print("   ✅ Health check passed")
+    else:
+        print("   ❌ Health check failed")
+    
+    # Test 2: API Endpoints
+    for endpoint, response in zip(endpoints[1:], responses[1:]):
+        if isinstance(response, Exception):
+            print(f"   ❌ {endpoint} - Error: {response}")
+        elif response.status_code == 200:
+            print(f"   ✅ {endpoint} - OK")
+        else:
+            print(f"   ⚠️  {endpoint} - {response.status_code}")
+
 def run_tests():
     """Run Sprint 5 Phase 1 tests"""
     local_ip = get_local_ip()
@@ -81,7 +155,7 @@ def run_tests():
     print()
     
     # Check if backend is running
-    if not check_backend_running():
+    if not check_backend_running(timeout=5):
         print("❌ Backend not running, starting it...")
         backend_process = start_backend()
         if not backend_process:
@@ -112,32 +186,7 @@ def run_tests():
     
     print("🧪 AUTOMATED TESTS:")
     
-    # Test 1: Health Check
-    try:
-        response = requests.get(f"http://{local_ip}:8000/health")
-        if response.status_code == 200:
-            print("   ✅ Health check passed")
-        else:
-            print("   ❌ Health check failed")
-    except Exception as e:
-        print(f"   ❌ Health check error: {e}")
-    
-    # Test 2: API Endpoints
-    endpoints = [
-        "/api/flashcards",
-        "/api/languages",
-        "/api/tts/voices"
-    ]
-    
-    for endpoint in endpoints:
-        try:
-            response = requests.get(f"http://{local_ip}:8000{endpoint}", timeout=5)
-            if response.status_code == 200:
-                print(f"   ✅ {endpoint} - OK")
-            else:
-                print(f"   ⚠️  {endpoint} - {response.status_code}")
-        except Exception as e:
-            print(f"   ❌ {endpoint} - Error: {e}")
+    asyncio.run(probe_endpoints(local_ip))
     
     print()
     print("🔧 DEBUG FEATURES:")
@@ -4,10 +4,15 @@ One-time authentication setup for Playwright tests
 Run this once to save your authenticated session
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import json
 import os
 import sys
+from pathlib import Path
+
+# Chromium profile reused by the automatic flow so the HTTP cache survives between runs
+# (the site's cookies/localStorage are cleared at the start of each run so login always runs)
+PROFILE_DIR = Path(__file__).parent / ".pw_profile"
 
 def setup_auth_manual():
     """
@@ -60,44 +65,69 @@ def setup_auth_automatic(email="test_playwright@example.com", password="TestPass
     If login fails, it will try to register the account first.
     """
     with sync_playwright() as p:
-        # Launch browser
-        browser = p.chromium.launch(headless=False)
-        
-        # Create context with HTTP Basic Auth credentials for production
-        context = browser.new_context(
+        # No human in the loop, so run headless on a persistent profile
+        # (includes HTTP Basic Auth credentials for production)
+        context = p.chromium.launch_persistent_context(
+            user_data_dir=str(PROFILE_DIR),
+            headless=True,
+            args=["--disable-dev-shm-usage"],
             http_credentials={"username": "beta", "password": "flashcards2025"}
         )
-        page = context.new_page()
+        page = context.pages[0] if context.pages else context.new_page()
         
         print("\n🔐 Starting AUTOMATIC authentication setup...")
         print(f"📧 Email: {email}")
         print(f"🔑 Password: {'*' * len(password)}\n")
         
+        # The profile keeps the last run's auth_token, and login.html redirects to '/' while it is valid;
+        # drop the site's cookies/localStorage (the HTTP cache stays) so the form is always shown
+        cdp = context.new_cdp_session(page)
+        cdp.send("Storage.clearDataForOrigin", {
+            "origin": "https://learn.rentyourcio.com",
+            "storageTypes": "cookies,local_storage",
+        })
+        cdp.detach()
+        
         # Go to the login page
         page.goto("https://learn.rentyourcio.com/login")
         
         # Wait for page to load
         page.wait_for_load_state("networkidle")
         
+        # Build each locator once and reuse it
+        email_field = page.locator('#loginEmail')
+        password_field = page.locator('#loginPassword')
+        # The submit button INSIDE #loginForm (not the Google OAuth button!)
+        login_submit = page.locator('#loginForm button[type="submit"]')
+        
         print("📝 Filling in login form...")
         
         # Fill in the login form
-        page.fill('#loginEmail', email)
-        page.fill('#loginPassword', password)
+        email_field.fill(email)
+        password_field.fill(password)
         
-        # Click the submit button INSIDE #loginForm (not the Google OAuth button!)
         print("🚀 Submitting login...")
-        page.click('#loginForm button[type="submit"]')
+        login_submit.click()
         
-        # Wait a moment and check where we are
-        page.wait_for_timeout(2000)
+        # Wait until we either leave the login page or an error message shows up
+        # (login.html always has an empty .error-message; showError() fills it and adds .show)
+        try:
+            page.wait_for_function(
+                """() => location.pathname !== '/login'
+                    || document.querySelector('.error-message.show')?.innerText.trim()""",
+                timeout=10000
+            )
+        except PlaywrightTimeoutError:
+            pass
         current_url = page.url
         print(f"📍 Current URL after submit: {current_url}")
         
-        # Check if there's an error message (login failed)
-        error_el = page.query_selector('.error-message, .alert, [role="alert"]')
-        if error_el and current_url.endswith('/login'):
-            error_text = error_el.inner_text()
+        # Check if there's an error message (login failed) - one round-trip for lookup + text
+        error_text = page.evaluate("""() => {
+            const el = document.querySelector('.error-message.show');
+            return el ? el.innerText.trim() : null;
+        }""")
+        if error_text and current_url.endswith('/login'):
             print(f"⚠️  Login failed: {error_text}")
             
             # If login failed, try to register the account
@@ -105,18 +135,18 @@ def setup_auth_automatic(email="test_playwright@example.com", password="TestPass
                 print("\n📝 Account doesn't exist. Creating test account...")
                 
                 # Switch to Register tab
-                page.click('button:has-text("Register")')
-                page.wait_for_timeout(500)
+                page.locator('button:has-text("Register")').click()
+                page.locator('#registerForm').wait_for(state="visible")
                 
-                # Fill in registration form
-                page.fill('#registerUsername', 'playwright_test')
-                page.fill('#registerEmail', email)
-                page.fill('#registerPassword', password)
-                
-                # Submit registration
+                # Fill in and submit the registration form in a single round-trip
+                # (the page's submit handler reads the fields via FormData)
                 print("✍️  Submitting registration...")
-                page.click('#registerForm button[type="submit"]')
-                page.wait_for_timeout(2000)
+                page.evaluate("""([username, email, password]) => {
+                    document.getElementById('registerUsername').value = username;
+                    document.getElementById('registerEmail').value = email;
+                    document.getElementById('registerPassword').value = password;
+                    document.getElementById('registerForm').requestSubmit();
+                }""", ['playwright_test', email, password])
                 
                 print("✅ Test account created! Now logging in...")
         
@@ -139,8 +169,8 @@ def setup_auth_automatic(email="test_playwright@example.com", password="TestPass
         
         print("✅ Login successful! Waiting for app to initialize...")
         
-        # Wait a bit for the app to fully initialize
-        page.wait_for_timeout(2000)
+        # Wait for the app's startup requests to settle
+        page.wait_for_load_state("networkidle")
         
         # Save the authentication state
         storage_state_path = os.path.join(os.path.dirname(__file__), "auth_state.json")
@@ -149,7 +179,7 @@ def setup_auth_automatic(email="test_playwright@example.com", password="TestPass
         print(f"\n✅ Authentication state saved to: {storage_state_path}")
         print("✅ Future tests will use this session!")
         
-        browser.close()
+        context.close()
 
 if __name__ == "__main__":
     # For now, always use Google OAuth (manual)
@@ -2,50 +2,174 @@
 """
 Pytest configuration for Playwright tests
 Automatically loads saved authentication state
+
+Set PW_CDP_ENDPOINT to reuse an already running Chromium instead of launching one per run:
+    chromium --remote-debugging-port=9222
+    PW_CDP_ENDPOINT=http://localhost:9222 pytest tests/
+
+Under pytest-xdist (pytest -n auto) every worker is its own session, so "session" fixtures
+below (browser, saved auth) are per worker and contexts/routes are never shared between workers
 """
 
-import pytest
+from __future__ import annotations
+
+import asyncio
 import os
-from playwright.sync_api import Page, Browser, BrowserContext
+import pytest
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Test modules importorskip playwright; keep this file importable so collection reports skips, not errors
+try:
+    from playwright.sync_api import Page, Browser, BrowserContext
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+try:
+    import pytest_asyncio
+    PYTEST_ASYNCIO_AVAILABLE = True
+except ImportError:
+    PYTEST_ASYNCIO_AVAILABLE = False
+
+
+AUTH_STATE_PATH = Path(__file__).parent / "auth_state.json"
+AUTH_STATE_EXISTS = AUTH_STATE_PATH.exists()
+# Saved sessions older than this are treated as expired and not loaded
+AUTH_STATE_MAX_AGE = 24 * 60 * 60
+AUTH_STATE_FRESH = AUTH_STATE_EXISTS and time.time() - AUTH_STATE_PATH.stat().st_mtime < AUTH_STATE_MAX_AGE
+
+# Options shared by every context; HTTP Basic Auth is for production site protection
+_BASE_CONTEXT_ARGS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "ignore_https_errors": True,
+    "http_credentials": {"username": "beta", "password": "flashcards2025"},
+}
+
+# Requests no test asserts on: images, fonts and media, plus analytics/error-reporting hosts
+# (cdn.tailwindcss.com is NOT blocked - the app's .hidden/.flex classes come from it)
+_BLOCKED_ASSETS_RE = re.compile(r"\.(png|jpe?g|gif|svg|webp|ico|woff2?|ttf|mp3|mp4|wav|webm)(\?.*)?$", re.IGNORECASE)
+_BLOCKED_HOSTS_RE = re.compile(r"https?://[^/]*(google-analytics|googletagmanager|segment\.(io|com)|sentry\.io)")
+
+
+def _prepare_context(context):
+    """
+    Shared setup for sync and async contexts: fail-fast timeouts and static assets blocked
+    Actions fail after 5s and navigations after 10s (instead of 30s) so a broken test fails fast;
+    expect() assertions already default to 5s. Pass timeout= explicitly where a wait needs longer.
+    Returns the route() results - awaitables on an async context, which the caller must await
+    """
+    context.set_default_timeout(5000)
+    context.set_default_navigation_timeout(10000)
+    return [
+        context.route(_BLOCKED_ASSETS_RE, lambda route: route.abort()),
+        context.route(_BLOCKED_HOSTS_RE, lambda route: route.abort()),
+    ]
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    """Launch args shared by the sync and async browsers (headless unless --headed)"""
+    return {
+        **browser_type_launch_args,
+        "args": [*browser_type_launch_args.get("args", []), "--disable-dev-shm-usage"],
+    }
+
+
+@pytest.fixture(scope="session")
+def browser(playwright, browser_type, launch_browser) -> Browser:
+    """
+    Attach to a long-lived Chromium over CDP when PW_CDP_ENDPOINT is set
+    Otherwise launch one as usual (honours --browser/--headed)
+    """
+    endpoint = os.environ.get("PW_CDP_ENDPOINT")
+    if endpoint:
+        browser = playwright.chromium.connect_over_cdp(endpoint)
+    else:
+        # Stop the whole run up front instead of erroring in every test
+        if not Path(browser_type.executable_path).exists():
+            pytest.exit(
+                f"❌ Playwright {browser_type.name} is not installed - run: "
+                f"python -m playwright install --with-deps {browser_type.name}",
+                returncode=1,
+            )
+        browser = launch_browser()
+    yield browser
+    # For a CDP connection this only disconnects; the shared Chromium keeps running
+    browser.close()
+
+
+def _load_storage_state():
+    return json.loads(AUTH_STATE_PATH.read_text(encoding="utf-8")) if AUTH_STATE_FRESH else None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _storage_state_future():
+    """Start parsing auth_state.json in the background so it overlaps the browser launch"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(_load_storage_state)
+    executor.shutdown(wait=False)
+    return future
+
+
+@pytest.fixture(scope="session")
+def _storage_state_dict(_storage_state_future):
+    """Saved cookies/session parsed once per run, or None if auth_setup.py hasn't been run"""
+    return _storage_state_future.result()
 
 
 @pytest.fixture(scope="session")
-def browser_context_args(browser_context_args):
+def _session_storage_state(_storage_state_dict):
+    """
+    Latest cookies/storage seen this session
+    Each context starts from it and writes back on close, so a manual login happens at most once
+    """
+    return {"state": _storage_state_dict}
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args, _storage_state_dict):
     """
     Configure browser context for all tests
     Loads saved authentication state if available
     Includes HTTP Basic Auth for production access
     """
-    auth_state_path = os.path.join(os.path.dirname(__file__), "auth_state.json")
-    
-    # HTTP Basic Auth for production site protection
-    http_credentials = {"username": "beta", "password": "flashcards2025"}
-    
-    if os.path.exists(auth_state_path):
-        print(f"\n🔑 Using saved authentication from: {auth_state_path}")
+    if _storage_state_dict is not None:
+        print(f"\n🔑 Using saved authentication from: {AUTH_STATE_PATH}")
         return {
             **browser_context_args,
-            "viewport": {"width": 1920, "height": 1080},
-            "ignore_https_errors": True,
-            "storage_state": auth_state_path,  # Load saved cookies/session
-            "http_credentials": http_credentials,  # HTTP Basic Auth
+            **_BASE_CONTEXT_ARGS,
+            "storage_state": _storage_state_dict,  # Saved cookies/session, already parsed
         }
     else:
-        print(f"\n⚠️ No saved authentication found at: {auth_state_path}")
+        if AUTH_STATE_EXISTS:
+            print(f"\n⚠️ Saved authentication is older than 24h, ignoring: {AUTH_STATE_PATH}")
+        else:
+            print(f"\n⚠️ No saved authentication found at: {AUTH_STATE_PATH}")
         print("   Run: python tests/auth_setup.py to save your login")
-        return {
-            **browser_context_args,
-            "viewport": {"width": 1920, "height": 1080},
-            "ignore_https_errors": True,
-            "http_credentials": http_credentials,  # HTTP Basic Auth
-        }
+        return {**browser_context_args, **_BASE_CONTEXT_ARGS}
+
+
+@pytest.fixture(scope="session")
+def open_context(browser: Browser, browser_context_args, _session_storage_state):
+    """Open a context on the shared browser seeded with the session's auth (see _prepare_context)"""
+    def _new_context() -> BrowserContext:
+        context = browser.new_context(**{**browser_context_args, "storage_state": _session_storage_state["state"]})
+        _prepare_context(context)
+        return context
+    return _new_context
 
 
 @pytest.fixture(scope="function")
-def context(browser: Browser, browser_context_args):
-    """Create a new context for each test with saved auth"""
-    context = browser.new_context(**browser_context_args)
+def context(open_context, _session_storage_state):
+    """Fresh context per test on the shared browser"""
+    context = open_context()
     yield context
+    _session_storage_state["state"] = context.storage_state()
     context.close()
 
 
@@ -55,3 +179,106 @@ def page(context: BrowserContext) -> Page:
     page = context.new_page()
     yield page
     page.close()
+
+
+# Canonical pronunciation API responses (same shape as backend/app/routers/pronunciation.py)
+MOCK_RECORD_RESPONSE = {
+    "attempt_id": "attempt-123",
+    "target_text": "Bonjour",
+    "transcribed_text": "Bonjour",
+    "overall_score": 0.95,
+    "word_scores": [
+        {"word": "Bonjour", "confidence": 0.95, "status": "good"}
+    ],
+    "ipa_target": "/bɔ̃.ʒuʁ/",
+    "feedback": "Excellent pronunciation!",
+}
+
+MOCK_PROGRESS_RESPONSE = {
+    "total_attempts": 12,
+    "avg_confidence": 0.82,
+    "problem_words": [
+        {"word": "grenouille", "avg_confidence": 0.54}
+    ],
+    "improvement_trend": "+12%",
+}
+
+# Serialized once at import; every mocked request reuses the same body
+_MOCK_RECORD_BODY = json.dumps(MOCK_RECORD_RESPONSE)
+_MOCK_PROGRESS_BODY = json.dumps(MOCK_PROGRESS_RESPONSE)
+
+
+def _fulfill_json(body):
+    return lambda route: route.fulfill(status=200, content_type="application/json", body=body)
+
+
+@pytest.fixture
+def mock_api(page: Page) -> Page:
+    """
+    Answer the pronunciation API from canned responses instead of the real backend
+    Tests that need an error can page.route() the same URL again - the newest route wins
+    """
+    page.route("**/api/v1/pronunciation/record", _fulfill_json(_MOCK_RECORD_BODY))
+    page.route("**/api/v1/pronunciation/progress/*", _fulfill_json(_MOCK_PROGRESS_BODY))
+    return page
+
+
+if PYTEST_ASYNCIO_AVAILABLE:
+    async def _new_async_context(async_browser, storage_state):
+        """Async counterpart of open_context: same options, timeouts and asset blocking"""
+        context = await async_browser.new_context(**_BASE_CONTEXT_ARGS, storage_state=storage_state)
+        await asyncio.gather(*_prepare_context(context))
+        return context
+
+
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def async_browser(browser_type_launch_args):
+        """
+        One async Chromium shared by every async test in the session
+        Honours --headed/--slowmo and PW_CDP_ENDPOINT like the sync browser fixture
+        """
+        async with async_playwright() as p:
+            endpoint = os.environ.get("PW_CDP_ENDPOINT")
+            if endpoint:
+                browser = await p.chromium.connect_over_cdp(endpoint)
+            else:
+                browser = await p.chromium.launch(**browser_type_launch_args)
+            yield browser
+            await browser.close()
+
+
+    @pytest_asyncio.fixture(loop_scope="session")
+    async def async_page(async_browser, _session_storage_state):
+        """Fresh context seeded with the session's auth, plus a page on the shared async browser"""
+        context = await _new_async_context(async_browser, _session_storage_state["state"])
+        page = await context.new_page()
+        yield page
+        _session_storage_state["state"] = await context.storage_state()
+        await context.close()
+
+
+    @pytest_asyncio.fixture(scope="module", loop_scope="session")
+    async def module_async_page(async_browser, _session_storage_state):
+        """Page whose context lives for the whole module, for read-only setup shared by several tests"""
+        context = await _new_async_context(async_browser, _session_storage_state["state"])
+        page = await context.new_page()
+        yield page
+        await context.close()
+
+
+    @pytest_asyncio.fixture(loop_scope="session")
+    async def async_context_factory(async_browser, _session_storage_state):
+        """
+        Open extra contexts on the shared async browser, e.g. to check several pages in parallel
+        Each starts from the given storage state (default: the session's auth); all close after the test
+        """
+        contexts = []
+        
+        async def new_context(storage_state=None):
+            context = await _new_async_context(async_browser, storage_state or _session_storage_state["state"])
+            contexts.append(context)
+            return context
+        
+        yield new_context
+        for context in contexts:
+            await context.close()
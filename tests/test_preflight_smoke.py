@@ -6,9 +6,12 @@ Target: deployed revision at BASE_URL (production).
 Run before deploy:
     pytest tests/test_preflight_smoke.py -x -q && gcloud builds submit ...
 """
-import pytest
 import os
 import base64
+import pytest
+
+pytest.importorskip("playwright")
+
 from playwright.sync_api import Playwright
 
 BASE = os.getenv("SF_BASE_URL", "https://learn.rentyourcio.com")
@@ -4,9 +4,18 @@ End-to-end Playwright tests for Pronunciation Practice Feature
 Tests the complete recording flow, UI interactions, and results display
 """
 
+import os
 import pytest
+
+pytest.importorskip("playwright")
+
 from playwright.sync_api import Page, expect
-import time
+
+# Every test talks to the canned pronunciation API from conftest.mock_api, never the real backend
+pytestmark = pytest.mark.usefixtures("mock_api")
+
+# Override for local runs, e.g. $env:SF_BASE_URL = "http://localhost:8000"
+BASE_URL = os.getenv("SF_BASE_URL", "https://learn.rentyourcio.com")
 
 
 class TestPronunciationRecordingFlow:
@@ -14,17 +23,16 @@ class TestPronunciationRecordingFlow:
     
     @pytest.fixture(autouse=True)
     def setup(self, page: Page):
-        """Setup for each test - navigate to app and login if needed"""
-        base_url = "http://localhost:3000" if "localhost" in page.context.browser.contexts[0].pages[0].url else "https://learn.rentyourcio.com"
-        page.goto(f"{base_url}/")
-        # Wait for app to load
-        page.wait_for_load_state("networkidle")
+        """Setup for each test - navigate to app (auth comes from the session's storage state)"""
+        page.goto(f"{BASE_URL}/", wait_until="domcontentloaded")
+        # Wait for app to load (the nav the tests click first)
+        page.wait_for_selector("text=Study")
     
     def test_pronunciation_recorder_appears_on_flashcard(self, page: Page):
         """Test that pronunciation recorder section appears on flashcard back"""
         # Navigate to study mode
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         
         # Flip card to see back
         page.click("text=Show Details")
@@ -41,7 +49,7 @@ class TestPronunciationRecordingFlow:
         """Test that recording buttons enable/disable correctly during recording lifecycle"""
         # Setup
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         record_btn = page.locator("button:has-text('Start Recording')")
@@ -63,7 +71,7 @@ class TestPronunciationRecordingFlow:
     def test_waveform_visualization_appears_during_recording(self, page: Page):
         """Test that waveform canvas appears when recording starts"""
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         # Check that waveform is initially hidden
@@ -73,49 +81,45 @@ class TestPronunciationRecordingFlow:
         # In a real test with audio recording, clicking record would show it
         # This is difficult to test in headless mode without mocking
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_results_display_after_submission(self, page: Page):
         """Test that results are displayed after recording submission"""
-        # This test would mock the API response
+        # Recording analysis is answered by mock_api (MOCK_RECORD_RESPONSE)
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
-        # Mock the API response for recording analysis
-        page.route("**/api/v1/pronunciation/record", route => {
-            route.abort("aborted")  # Don't actually call API for this test
-        })
-        
         # In a real test, after mock API response:
         # Results container should be visible
         # Overall score should be displayed
         # Word scores should be listed
         # Feedback should be shown
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_progress_stats_display(self, page: Page):
         """Test that user progress statistics are displayed"""
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
-        # Mock progress endpoint
-        page.route("**/api/v1/pronunciation/progress/*", route => {
-            route.abort("aborted")
-        })
+        # Progress endpoint is answered by mock_api (MOCK_PROGRESS_RESPONSE)
         
         # Progress section should be visible
         progress_container = page.locator(".progress-container")
         # In real test with data: expect(progress_container).to_be_visible()
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_try_again_button_resets_recording(self, page: Page):
         """Test that 'Try Again' button allows new recording after results"""
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         # After recording and getting results,
         # "Try Again" button should reset the recorder state
         # This would be visible in a real test with actual recording
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_results_word_scores_display_correctly(self, page: Page):
         """Test that word-by-word scores are formatted correctly"""
         # Results should show:
@@ -125,6 +129,7 @@ class TestPronunciationRecordingFlow:
         # - Status text (good/acceptable/needs_work)
         pass
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_ipa_pronunciation_display(self, page: Page):
         """Test that IPA pronunciation is displayed in results"""
         # IPA section should show target pronunciation
@@ -137,7 +142,7 @@ class TestPronunciationRecordingFlow:
         page.set_viewport_size({"width": 375, "height": 667})
         
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         # Recorder should still be visible and functional on mobile
@@ -151,7 +156,7 @@ class TestPronunciationRecordingFlow:
     def test_recording_time_display_updates(self, page: Page):
         """Test that recording time counter updates during recording"""
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         # Time display should show 00:00 initially
@@ -161,16 +166,18 @@ class TestPronunciationRecordingFlow:
         # After 5 seconds of recording (if actually recording),
         # time would update to 00:05
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_microphone_permission_error_handling(self, page: Page):
         """Test that microphone permission errors are handled gracefully"""
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         # If microphone access is denied, error message should appear
         # Instead of crashing the app
         # This would be tested with proper browser context configuration
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_score_color_coding(self, page: Page):
         """Test that overall score is color-coded based on performance"""
         # Excellent (>0.85): Green
@@ -179,12 +186,14 @@ class TestPronunciationRecordingFlow:
         # Needs Work (<0.60): Red
         pass
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_problem_words_list_in_progress(self, page: Page):
         """Test that problem words are listed in progress stats"""
         # Progress section should show top 3 problem words
         # With lowest confidence scores
         pass
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_improvement_trend_calculation(self, page: Page):
         """Test that improvement trend is displayed correctly"""
         # Should show percentage improvement or regression
@@ -195,61 +204,43 @@ class TestPronunciationRecordingFlow:
 class TestPronunciationAPIIntegration:
     """Test integration with pronunciation API"""
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_successful_recording_submission(self, page: Page):
         """Test successful recording upload and analysis"""
-        # Mock successful API response
-        page.route("**/api/v1/pronunciation/record", route => {
-            route.fulfill({
-                status: 200,
-                contentType: "application/json",
-                body: JSON.stringify({
-                    attempt_id: "attempt-123",
-                    target_text: "Bonjour",
-                    transcribed_text: "Bonjour",
-                    overall_score: 0.95,
-                    word_scores: [
-                        {"word": "Bonjour", "confidence": 0.95, "status": "good"}
-                    ],
-                    ipa_target: "/bɔ̃.ʒuʁ/",
-                    feedback: "Excellent pronunciation!"
-                })
-            })
-        })
+        # Successful API response comes from mock_api (MOCK_RECORD_RESPONSE)
+        pass
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_api_error_handling(self, page: Page):
         """Test that API errors are displayed to user"""
         # Mock API error response
-        page.route("**/api/v1/pronunciation/record", route => {
-            route.abort("failed")
-        })
+        page.route("**/api/v1/pronunciation/record", lambda route: route.abort("failed"))
         
         # Error message should display to user
         # "Error: Failed to analyze pronunciation"
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_network_timeout_handling(self, page: Page):
         """Test handling of network timeouts during submission"""
-        # Mock timeout
-        page.route("**/api/v1/pronunciation/record", route => {
-            # Simulate timeout after 10 seconds
-            import time
-            time.sleep(10)
-            route.abort("timedout")
-        })
+        # Mock timeout - answer with a gateway timeout instead of actually waiting
+        page.route("**/api/v1/pronunciation/record", lambda route: route.fulfill(status=504))
 
 
 class TestProgressTracking:
     """Test pronunciation progress tracking and statistics"""
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_progress_endpoint_called_on_load(self, page: Page):
         """Test that progress endpoint is called when recorder loads"""
         page.click("text=Study")
-        page.wait_for_selector(".flashcard", timeout=5000)
+        page.wait_for_selector(".flashcard")
         page.click("text=Show Details")
         
         # Progress endpoint should be called
         # response = page.wait_for_event("response", lambda response: "pronunciation/progress" in response.url)
         # expect(response.status).to_equal(200)
     
+    @pytest.mark.skip(reason="TODO: not implemented")
     def test_progress_stats_update_after_recording(self, page: Page):
         """Test that progress stats update after successful recording"""
         # After successful submission, stats should reflect new attempt
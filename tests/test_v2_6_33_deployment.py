@@ -10,91 +10,118 @@ Tests all fixes from latest deployment:
 - Delete buttons in browse
 """
 
-import pytest
 import re
-from playwright.sync_api import Page, expect
-import time
-
-
-BASE_URL = "https://learn.rentyourcio.com"
-
-
-def test_simple_page_load(page: Page):
-    """
-    Smoke test: Verify production site loads
-    """
-    print("\n🧪 Test 1: Simple page load...")
-    
-    page.goto(BASE_URL)
-    
-    # Verify page title contains expected text
-    expect(page).to_have_title(re.compile(".*Flashcard.*", re.IGNORECASE))
-    
-    # Verify page loaded
-    expect(page.locator("body")).to_be_visible()
-    
-    print("✅ Page loads successfully")
+import pytest
 
+pytest.importorskip("playwright")
 
-def test_version_badge(page: Page):
-    """
-    Test 2: Version badge shows v2.6.33
-    """
-    print("\n🧪 Test 2: Version badge...")
-    
-    page.goto(BASE_URL)
-    
-    # Wait for page to load
-    page.wait_for_load_state("networkidle")
-    
-    # Check version badge (using get_by_text from codegen)
-    version = page.get_by_text("v2.6.33")
-    expect(version).to_be_visible(timeout=5000)
-    
-    print("✅ Version badge shows v2.6.33")
-
+from playwright.sync_api import Page, expect
 
-def test_navigation_buttons_visible(page: Page):
-    """
-    Test 3: All 4 navigation buttons visible (Study, Read, Browse, Import)
-    """
-    print("\n🧪 Test 3: Navigation buttons...")
-    
-    page.goto(BASE_URL)
-    page.wait_for_load_state("networkidle")
-    
-    # Check all 4 buttons using text matching (avoid emoji encoding issues)
-    nav_buttons = ["Study", "Read", "Browse", "Import"]
-    
-    for button_text in nav_buttons:
-        # Use get_by_role with text name only
-        button = page.get_by_role("button", name=button_text)
-        expect(button).to_be_visible(timeout=5000)
-        print(f"  ✅ {button_text} button visible")
-    
-    print("✅ All 4 navigation buttons visible")
 
+BASE_URL = "https://learn.rentyourcio.com"
 
-def test_navigation_buttons_clickable(page: Page):
-    """
-    Test 4: Navigation buttons are clickable and switch modes
-    """
-    print("\n🧪 Test 4: Navigation buttons clickable...")
-    
-    page.goto(BASE_URL)
-    page.wait_for_load_state("networkidle")
-    page.wait_for_timeout(1000)
-    
-    # Test each navigation button using text names (avoid emoji issues)
-    buttons = ["Study", "Read", "Browse", "Import"]
-    
-    for button_text in buttons:
-        button = page.get_by_role("button", name=button_text)
+# Container switchMode() reveals for each navigation button
+MODE_CONTAINERS = {
+    "Study": "#study-mode",
+    "Read": "#read-mode",
+    "Browse": "#browse-mode",
+    "Import": "#content-import",
+}
+
+_TITLE_RE = re.compile(r".*Flashcard.*", re.IGNORECASE)
+# Common delete-button patterns: title, aria-label, emoji or class
+_DELETE_SELECTOR = "button[title*='Delete'], button[aria-label*='Delete'], button:has-text('🗑️'), .delete-button, button.delete-card"
+
+
+class TestV26_33Smoke:
+    """
+    Tests 1-4 and 8 only need the loaded home page, so they share one navigation
+    """
+    
+    @pytest.fixture(scope="class")
+    def loaded_page(self, open_context):
+        """Home page loaded once for the whole class (page/context are per test, so open our own)"""
+        context = open_context()
+        page = context.new_page()
+        page.goto(BASE_URL, wait_until="domcontentloaded")
+        page.wait_for_selector("text=v2.6.33")
+        yield page
+        context.close()
+    
+    def test_simple_page_load(self, loaded_page: Page):
+        """
+        Smoke test: Verify production site loads
+        """
+        print("\n🧪 Test 1: Simple page load...")
+        
+        # Verify page title contains expected text
+        expect(loaded_page).to_have_title(_TITLE_RE)
+        
+        # Verify page loaded
+        expect(loaded_page.locator("body")).to_be_visible()
+        
+        print("✅ Page loads successfully")
+    
+    def test_version_badge(self, loaded_page: Page):
+        """
+        Test 2: Version badge shows v2.6.33
+        """
+        print("\n🧪 Test 2: Version badge...")
+        
+        # Check version badge (using get_by_text from codegen)
+        version = loaded_page.get_by_text("v2.6.33")
+        expect(version).to_be_visible()
+        
+        print("✅ Version badge shows v2.6.33")
+    
+    @pytest.mark.parametrize("button_text", list(MODE_CONTAINERS))
+    def test_navigation_button_visible(self, loaded_page: Page, button_text):
+        """
+        Test 3: Each navigation button visible (Study, Read, Browse, Import)
+        """
+        print(f"\n🧪 Test 3: {button_text} navigation button...")
+        
+        # Use get_by_role with text name only (avoid emoji encoding issues)
+        button = loaded_page.get_by_role("button", name=button_text)
+        expect(button).to_be_visible()
+        
+        print(f"✅ {button_text} button visible")
+    
+    @pytest.mark.parametrize("button_text, container", MODE_CONTAINERS.items())
+    def test_navigation_button_clickable(self, loaded_page: Page, button_text, container):
+        """
+        Test 4: Each navigation button is clickable and switches mode
+        (only switches the visible mode, so the shared page stays usable for later tests)
+        """
+        print(f"\n🧪 Test 4: {button_text} button clickable...")
+        
+        # Use text names (avoid emoji issues)
+        button = loaded_page.get_by_role("button", name=button_text)
         button.click()
-        page.wait_for_timeout(500)
-        print(f"  ✅ Clicked {button_text}")
-    
-    print("✅ All navigation buttons clickable")
+        expect(loaded_page.locator(container)).to_be_visible()
+        
+        print(f"✅ Clicked {button_text}")
+    
+    def test_full_hard_refresh(self, loaded_page: Page):
+        """
+        Test 8: Hard refresh (Ctrl+Shift+R simulation)
+        Reloads the shared page, so it runs last in the class
+        """
+        print("\n🧪 Test 8: Hard refresh simulation...")
+        
+        # Hard refresh by forcing cache bypass
+        loaded_page.reload(wait_until="domcontentloaded")
+        # App is ready once languages have loaded into the selector
+        loaded_page.wait_for_selector("#language-select option:nth-child(2)", state="attached", timeout=10000)
+        
+        # Verify page still loads correctly
+        expect(loaded_page.locator("body")).to_be_visible()
+        
+        # Check version still shows v2.6.33 using get_by_text
+        version = loaded_page.get_by_text("v2.6.33")
+        expect(version).to_be_visible()
+        
+        print("✅ Hard refresh successful")
 
 
 def test_delete_buttons_in_browse(page: Page):
@@ -103,17 +130,17 @@ def test_delete_buttons_in_browse(page: Page):
     """
     print("\n🧪 Test 5: Delete buttons in Browse...")
     
-    page.goto(BASE_URL)
-    page.wait_for_load_state("networkidle")
+    page.goto(BASE_URL, wait_until="domcontentloaded")
     
     # Click Browse button using get_by_role
     browse_btn = page.get_by_role("button", name="📖 Browse")
     browse_btn.click()
-    page.wait_for_timeout(1000)
+    expect(page.locator("#browse-mode")).to_be_visible()
+    # Cards (or the empty-list message) have been rendered into the list
+    page.wait_for_selector("#cards-list > *")
     
     # Look for delete buttons (try multiple selectors)
-    # Common patterns: button with title, aria-label, or emoji
-    delete_buttons = page.locator("button[title*='Delete'], button[aria-label*='Delete'], button:has-text('🗑️'), .delete-button, button.delete-card")
+    delete_buttons = page.locator(_DELETE_SELECTOR)
     
     # Check if at least one delete button exists
     count = delete_buttons.count()
@@ -137,8 +164,9 @@ def test_url_parameter_cardid(page: Page):
     # You can add a real UUID here after creating a test card
     test_uuid = "00000000-0000-0000-0000-000000000000"  # Replace with real UUID
     
-    page.goto(f"{BASE_URL}/?cardId={test_uuid}")
-    page.wait_for_load_state("networkidle")
+    page.goto(f"{BASE_URL}/?cardId={test_uuid}", wait_until="domcontentloaded")
+    # Shared-card lookup always finishes with a toast (opened / not found)
+    expect(page.locator("#toast")).to_be_visible(timeout=10000)
     
     # Just verify page loads without error
     expect(page.locator("body")).to_be_visible()
@@ -153,9 +181,9 @@ def test_url_parameter_word(page: Page):
     print("\n🧪 Test 7: URL parameter ?word=X&language=Y...")
     
     # Try with a common word
-    page.goto(f"{BASE_URL}/?word=hello&language=Greek")
-    page.wait_for_load_state("networkidle")
-    page.wait_for_timeout(2000)
+    page.goto(f"{BASE_URL}/?word=hello&language=Greek", wait_until="domcontentloaded")
+    # Shared-card lookup always finishes with a toast (opened / not found)
+    expect(page.locator("#toast")).to_be_visible(timeout=10000)
     
     # Just verify page loads without error
     expect(page.locator("body")).to_be_visible()
@@ -163,29 +191,7 @@ def test_url_parameter_word(page: Page):
     print("✅ URL parameter ?word support verified")
 
 
-def test_full_hard_refresh(page: Page):
-    """
-    Test 8: Hard refresh (Ctrl+Shift+R simulation)
-    """
-    print("\n🧪 Test 8: Hard refresh simulation...")
-    
-    page.goto(BASE_URL)
-    page.wait_for_load_state("networkidle")
-    
-    # Hard refresh by forcing cache bypass
-    page.reload(wait_until="networkidle")
-    page.wait_for_timeout(1000)
-    
-    # Verify page still loads correctly
-    expect(page.locator("body")).to_be_visible()
-    
-    # Check version still shows v2.6.33 using get_by_text
-    version = page.get_by_text("v2.6.33")
-    expect(version).to_be_visible(timeout=5000)
-    
-    print("✅ Hard refresh successful")
-
-
 if __name__ == "__main__":
-    # Run these tests directly
-    pytest.main([__file__, "-v", "--headed", "--slowmo=500"])
+    # Run these tests directly (headless); to watch them, pass --headed --slowmo=500
+    # on the pytest command line or set PWDEBUG=1 for the Playwright Inspector
+    pytest.main([__file__, "-v"])